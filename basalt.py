@@ -1,26 +1,313 @@
 # Basalt Interpreter - Copyright (c) 2026 BasaltDev
 # Licensed under the MIT License.
 
-import colorama
-import os
 import time
+LOAD_START = time.perf_counter()
+import os
 import sys
-import subprocess
-import random
 import math
-import requests
+import mmap
+import atexit
+import threading
+import collections
+import importlib
+import json
+import queue
+import glob
+import io
+import codecs
+import signal
+import select
+import marshal
+import struct
+
+class LazyModule:
+    # stands in for a module until something actually uses it, so a script that only prints doesn't pay for requests & co.
+    def __init__(self, name, target=None):
+        self._name = name
+        self._target = target or name # e.g. "concurrent.futures" still gets used as concurrent.futures.X
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            importlib.import_module(self._target)
+            self._module = sys.modules[self._name]
+            import_times.setdefault(self._target, time.perf_counter() - start)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+import_times = {}
+
+colorama = LazyModule("colorama")
+subprocess = LazyModule("subprocess")
+random = LazyModule("random")
+concurrent = LazyModule("concurrent", "concurrent.futures")
+hashlib = LazyModule("hashlib")
+email = LazyModule("email", "email.utils")
+pickle = LazyModule("pickle")
+asyncio = LazyModule("asyncio")
+requests = LazyModule("requests")
+socket = LazyModule("socket")
+statistics = LazyModule("statistics")
+LAZY_MODULES = [colorama, subprocess, random, concurrent, hashlib, email, pickle, asyncio, requests, socket]
+
+def preload():
+    # for long-lived processes (--serve) that would rather pay for everything once up front
+    for module in LAZY_MODULES:
+        module._load()
+
+def running_loop():
+    # nothing can be running an event loop if asyncio was never imported
+    if "asyncio" not in sys.modules:
+        return None
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+class BasaltError(Exception):
+    def __init__(self, message, line, code=1):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+        self.code = code # exit status for whoever ran the script
+        self.reported = False
+
+    def __reduce__(self):
+        # parallel foreach workers send these back to the parent process
+        return (BasaltError, (self.message, self.line, self.code))
+
+    def __str__(self):
+        return f"Error at line {self.line}: {self.message}"
+
+class BasaltExit(SystemExit):
+    # exit() in a script, still a plain SystemExit for the cli
+    def __init__(self, code, line):
+        super().__init__(code)
+        self.line = line
+
+class Context:
+    # everything a single program run needs, so several runs can share one process
+    def __init__(self, argv=None, parent_folder=None, filename=None, stdout=None, stdin=None, hooks=None):
+        self.argv = argv or [] # [script, args...]
+        self.parent_folder = parent_folder or os.getcwd()
+        self.filename = filename
+        self.stdout = stdout # None means the real sys.stdout/sys.stdin
+        self.stdin = stdin
+        self.modules = {} # path -> (program, exports), every module runs once per context
+        self.loading = [] # import chain, to catch circular imports
+        self.imported = [] # every module path this run tried to load, even the ones that blew up (for --watch)
+        self.mapped = [] # file map()s, closed once the run is over
+        self.http = HTTPClient()
+        self.hook_list = list(hooks or [])
+        self.hooks = Hooks(self.hook_list) if self.hook_list else None # None keeps the interpreter on its fast path
+
+    def add_hook(self, hook):
+        self.hook_list.append(hook)
+        self.hooks = Hooks(self.hook_list)
+
+    def remove_hook(self, hook):
+        self.hook_list.remove(hook)
+        self.hooks = Hooks(self.hook_list) if self.hook_list else None
+
+    def close(self):
+        # end of a run, whoever reads the files next (the host, the parent process) sees everything that was written
+        for mapped in self.mapped:
+            mapped.close()
+        self.mapped.clear()
+        file_pool.flush_all()
+
+    def input(self, prompt=""):
+        if self.stdout is None and self.stdin is None:
+            return input(prompt)
+        stdout = self.stdout or sys.stdout
+        stdout.write(str(prompt))
+        stdout.flush()
+        line = (self.stdin or sys.stdin).readline()
+        if not line:
+            raise EOFError("EOF when reading a line")
+        return line.rstrip("\n")
+
+    def __getstate__(self):
+        # worker processes print to their own stdout
+        state = dict(self.__dict__)
+        state.update(stdout=None, stdin=None, modules={}, loading=[], imported=[], mapped=[], hook_list=[], hooks=None)
+        return state
+
+class Hooks:
+    # hands interpreter events to hook objects, a hook only needs the on_* methods it cares about:
+    #   on_statement(line, kind)   a new line starts, kind is its keyword (or "identifier", "end", ...)
+    #   on_call(fn, args)          a function/method gets called, args are plain values by parameter name
+    #   on_return(fn, value)       ...and returns (value is None if it blew up)
+    #   on_builtin(name, duration) a builtin statement finished, not counting blocks/functions it ran
+    #   on_enter(line), on_leave() a block or function body starts/ends
+    EVENTS = ["on_statement", "on_call", "on_return", "on_builtin", "on_enter", "on_leave"]
+
+    def __init__(self, hooks):
+        for event in self.EVENTS:
+            setattr(self, event, [getattr(hook, event) for hook in hooks if callable(getattr(hook, event, None))])
+        self.pending = threading.local() # builtin that's running on this thread, and since when
+
+    def finish_builtin(self):
+        pending = getattr(self.pending, "builtin", None)
+        if pending is not None:
+            self.pending.builtin = None
+            duration = time.perf_counter() - pending[1]
+            for handler in self.on_builtin:
+                handler(pending[0], duration)
+
+    def statement(self, line, token):
+        self.finish_builtin()
+        if self.on_statement:
+            kind = "end" if token is None else (token[1] if token[0] == "KEYWORD" else token[0].lower())
+            for handler in self.on_statement:
+                handler(line, kind)
+
+    def keyword(self, name):
+        if self.on_builtin:
+            self.finish_builtin()
+            self.pending.builtin = (name, time.perf_counter())
+
+    def enter(self, line):
+        self.finish_builtin()
+        for handler in self.on_enter:
+            handler(line)
 
-argv = sys.argv
-argc = len(argv)
-parent_folder = None
+    def leave(self):
+        self.finish_builtin()
+        for handler in self.on_leave:
+            handler()
+
+    def call(self, name, args):
+        if self.on_call:
+            values = {param: record["value"] for param, record in (args or {}).items()}
+            for handler in self.on_call:
+                handler(name, values)
+
+    def ret(self, name, value):
+        for handler in self.on_return:
+            handler(name, value)
+
+class Profiler:
+    # time per line, function and builtin, whatever is running right now gets the clock
+    # only follows the thread that created it, spawned tasks on other threads aren't counted
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.line_times = collections.Counter() # (function, line) -> seconds
+        self.line_hits = collections.Counter()
+        self.function_times = collections.Counter() # inclusive, recursion only counted once
+        self.function_calls = collections.Counter()
+        self.builtin_times = collections.Counter() # keyword -> seconds spent in that statement itself
+        self.builtin_calls = collections.Counter()
+        self.stack_times = collections.Counter() # ("<main>", "fn", ..., "line N") -> seconds, for flamegraphs
+        self.blocks = [] # what was running when each enclosing block started
+        self.calls = [] # (function, started)
+        self.current = ("<main>", 1)
+        self.stack = ("<main>",)
+        self.mark = time.perf_counter()
+
+    def function(self):
+        return self.calls[-1][0] if self.calls else "<main>"
+
+    def switch(self, key, stack=None):
+        now = time.perf_counter()
+        elapsed = now - self.mark
+        self.line_times[self.current] += elapsed
+        self.stack_times[self.stack + (f"line {self.current[1]}",)] += elapsed
+        self.mark = now
+        self.current = key
+        self.stack = stack or ("<main>",) + tuple(name for name, _ in self.calls)
+
+    # hook side (see Hooks)
+    def on_statement(self, number, kind):
+        if threading.get_ident() == self.thread:
+            key = (self.function(), number)
+            self.line_hits[key] += 1
+            self.switch(key)
+
+    def on_builtin(self, name, duration):
+        if threading.get_ident() == self.thread:
+            self.builtin_calls[name] += 1
+            self.builtin_times[name] += duration
+
+    def on_enter(self, number):
+        if threading.get_ident() == self.thread:
+            self.blocks.append((self.current, self.stack))
+            self.switch((self.function(), number))
+
+    def on_leave(self):
+        if threading.get_ident() == self.thread and self.blocks:
+            self.switch(*self.blocks.pop())
+
+    def on_call(self, name, args):
+        if threading.get_ident() == self.thread:
+            self.function_calls[name] += 1
+            self.calls.append((name, time.perf_counter()))
+
+    def on_return(self, name, value):
+        if threading.get_ident() == self.thread and self.calls:
+            name, started = self.calls.pop()
+            if all(active != name for active, _ in self.calls):
+                self.function_times[name] += time.perf_counter() - started
+
+    def stop(self):
+        self.switch(self.current, self.stack)
+
+    def report(self, limit=10):
+        total = sum(self.line_times.values()) or 1e-12
+        lines = [f"Hottest lines ({total * 1000:.3f}ms total):", "       time       %     hits  where"]
+        for (function, line), seconds in self.line_times.most_common(limit):
+            lines.append(f"  {seconds * 1000:9.3f}ms {seconds / total * 100:6.1f}% {self.line_hits[(function, line)]:8}  line {line} ({function})")
+        if self.function_times:
+            lines.append("Functions and methods (including what they call):")
+            lines.append("       time       %    calls  name")
+            for name, seconds in self.function_times.most_common(limit):
+                lines.append(f"  {seconds * 1000:9.3f}ms {seconds / total * 100:6.1f}% {self.function_calls[name]:8}  {name}")
+        if self.builtin_times:
+            lines.append("Builtins (just the statement itself):")
+            lines.append("       time       %    calls  keyword")
+            for name, seconds in self.builtin_times.most_common(limit):
+                lines.append(f"  {seconds * 1000:9.3f}ms {seconds / total * 100:6.1f}% {self.builtin_calls[name]:8}  {name}")
+        return "\n".join(lines)
+
+    def collapsed(self):
+        # "frame;frame;frame microseconds" per line, what flamegraph.pl/speedscope/inferno read
+        return "".join(f"{';'.join(stack)} {round(seconds * 1e6)}\n" for stack, seconds in sorted(self.stack_times.items()) if round(seconds * 1e6) > 0)
+
+    def to_json(self):
+        return {
+            "total": sum(self.line_times.values()),
+            "lines": [{"function": function, "line": line, "time": seconds, "hits": self.line_hits[(function, line)]} for (function, line), seconds in self.line_times.most_common()],
+            "functions": [{"name": name, "time": seconds, "calls": self.function_calls[name]} for name, seconds in self.function_times.most_common()],
+            "builtins": [{"name": name, "time": seconds, "calls": self.builtin_calls[name]} for name, seconds in self.builtin_times.most_common()]
+        }
+
+def report_error(error, file=None):
+    if error.reported:
+        return
+    error.reported = True
+    red = colorama.Fore.RED
+    yellow = colorama.Fore.YELLOW
+    reset = colorama.Fore.RESET
+    print(f"{red}Error at line {yellow}{error.line}{red}: {error.message}{reset}", file=file)
 
 class Lexer:
-    def __init__(self, source_code, keywords=None):
+    def __init__(self, source_code, keywords=None, namespaces=()):
         self.source_code = source_code
         self.position = 0
-        self.current_char = self.source_code[self.position]
+        self.current_char = self.source_code[self.position] if self.source_code else None
         self.tokens = []
         self.keywords = keywords or []
+        self.namespaces = set(namespaces) # module aliases (import ... as lib), the only names a dot can continue
+
+    def line(self):
+        return self.source_code.count("\n", 0, self.position) + 1
+
+    def error(self, error_message):
+        raise BasaltError(error_message, self.line())
 
     def advance(self):
         self.position += 1
@@ -37,8 +324,8 @@ class Lexer:
     
     def get_identifier(self):
         output = ""
-        while self.current_char is not None and (self.current_char.isalpha() or self.current_char.isdigit() or self.current_char == "_"):
-            output += self.current_char
+        while self.current_char is not None and (self.current_char.isalpha() or self.current_char.isdigit() or self.current_char == "_" or (self.current_char == "." and output in self.namespaces and ((self.peek() or " ").isalpha() or self.peek() == "_"))):
+            output += self.current_char # dots only show up in qualified names (lib.name)
             self.advance()
         self.position -= 1
         return output
@@ -103,6 +390,8 @@ class Lexer:
                     else:
                         identifier = False
                 self.tokens.append((prefix, identifier))
+                if len(self.tokens) >= 4 and self.tokens[-4] == ("KEYWORD", "import") and self.tokens[-2] == ("IDENTIFIER", "as"):
+                    self.namespaces.add(identifier) # from here on lib.name lexes as one name
             elif self.current_char == "<":
                 if self.peek() == "-" and self.peek(2) == "-":
                     if self.peek(3) == "-" and self.peek(4) == "-":
@@ -162,6 +451,8 @@ class Lexer:
                 elif self.peek() == ">":
                     self.tokens.append(("RETURN_OPERATOR", "->"))
                     self.advance()
+                elif self.peek() is None:
+                    self.error("unexpected end of input after '-'")
                 elif self.peek().isdigit():
                     self.advance()
                     number = self.get_number()
@@ -196,6 +487,8 @@ class Lexer:
             elif self.current_char == ":":
                 self.tokens.append(("COLON", ":"))
             elif self.current_char == "@":
+                if self.peek() is None:
+                    self.error("unexpected end of input after '@'")
                 if self.peek().isalpha() or self.peek() == "_":
                     self.advance()
                     identifier = self.get_identifier()
@@ -208,22 +501,782 @@ class Lexer:
                 self.tokens.append(("NEWLINE", "\n"))
             self.advance()
         return self.tokens
-   
+
+mapped_files = {} # realpath -> mapped files still open on it
+mapped_lock = threading.Lock()
+
+def unmap(path):
+    # truncating a file under a live mmap kills the whole process with SIGBUS, so writes close its mappings first
+    with mapped_lock:
+        mapped = mapped_files.pop(os.path.realpath(path), [])
+    for file in mapped:
+        file.close()
+
+class MappedFile:
+    # read-only view of a file through mmap, only the pages you actually touch get loaded
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        if os.fstat(self.file.fileno()).st_size == 0:
+            self.data = b"" # mmap refuses empty files
+        else:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.line_offsets = [0]
+        self.scanned = 0
+        self.closed = False
+        with mapped_lock:
+            mapped_files.setdefault(os.path.realpath(path), []).append(self)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if type(index) == slice:
+            return self.data[index].decode("utf-8", errors="replace")
+        if index < 0:
+            index += len(self.data)
+        if index < 0 or index >= len(self.data):
+            raise IndexError("mapped file index out of range")
+        return self.data[index:index + 1].decode("utf-8", errors="replace")
+
+    def __iter__(self):
+        number = 0
+        while True:
+            line = self.line(number)
+            if line is None:
+                return
+            yield line
+            number += 1
+
+    def __repr__(self):
+        return f"<mapped file '{os.path.basename(self.path)}' ({len(self.data)} bytes)>"
+
+    def find(self, needle, start=0):
+        return self.data.find(needle.encode("utf-8"), start)
+
+    def line(self, number):
+        # only scan as far as the requested line, so peeking at headers stays cheap
+        while len(self.line_offsets) <= number + 1 and self.scanned is not None:
+            newline = self.data.find(b"\n", self.scanned)
+            if newline == -1:
+                if self.line_offsets[-1] < len(self.data):
+                    self.line_offsets.append(len(self.data) + 1)
+                self.scanned = None
+            else:
+                self.line_offsets.append(newline + 1)
+                self.scanned = newline + 1
+        if number < 0 or number + 1 >= len(self.line_offsets):
+            return None
+        start, end = self.line_offsets[number], self.line_offsets[number + 1] - 1
+        return self.data[start:end].rstrip(b"\r").decode("utf-8", errors="replace")
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        with mapped_lock:
+            mapped = mapped_files.get(os.path.realpath(self.path), [])
+            if self in mapped:
+                mapped.remove(self)
+        if type(self.data) == mmap.mmap:
+            self.data.close()
+        self.data = b""
+        self.file.close()
+
+class FilePool:
+    # keeps write handles open between file write()/append() calls, opening and closing
+    # the file every single time was most of what logging loops spent their time on
+    def __init__(self, size=16):
+        self.size = size
+        self.handles = collections.OrderedDict()
+        self.pinned = set()
+        self.lock = threading.Lock()
+
+    def handle(self, path):
+        # returns the handle and whether the pool kept it
+        path = os.path.realpath(path)
+        handle = self.handles.get(path)
+        if handle is None:
+            handle = open(path, 'a')
+            self.handles[path] = handle
+            self.evict(path)
+            if len(self.handles) > self.size and path not in self.pinned:
+                # everything else is pinned by file open(), this one gets used once and closed
+                del self.handles[path]
+                return handle, False
+        else:
+            self.handles.move_to_end(path)
+        return handle, True
+
+    def evict(self, keep):
+        for path in list(self.handles):
+            if len(self.handles) <= self.size:
+                break
+            if path != keep and path not in self.pinned:
+                self.handles.pop(path).close()
+
+    def write(self, path, text):
+        with self.lock:
+            handle, pooled = self.handle(path)
+            handle.seek(0)
+            handle.truncate()
+            handle.write(text)
+            if not pooled:
+                handle.close()
+
+    def append(self, path, text):
+        with self.lock:
+            handle, pooled = self.handle(path)
+            handle.write(text)
+            if not pooled:
+                handle.close()
+
+    def flush(self, path):
+        with self.lock:
+            handle = self.handles.get(os.path.realpath(path))
+            if handle is not None:
+                handle.flush()
+
+    def flush_all(self):
+        # end of a run, before system() and before forking, so nobody else reads a half-written file
+        with self.lock:
+            for handle in self.handles.values():
+                handle.flush()
+
+    def open(self, path):
+        with self.lock:
+            self.pinned.add(os.path.realpath(path))
+            self.handle(path)
+
+    def close(self, path):
+        path = os.path.realpath(path)
+        with self.lock:
+            self.pinned.discard(path)
+            handle = self.handles.pop(path, None)
+            if handle is not None:
+                handle.close()
+
+    def close_all(self):
+        with self.lock:
+            for handle in self.handles.values():
+                handle.close()
+            self.handles.clear()
+            self.pinned.clear()
+
+file_pool = FilePool()
+atexit.register(file_pool.close_all)
+
+http_settings = { # what every run starts with, http timeout() only changes its own run's copy
+    "timeout": float(os.environ.get("BASALT_HTTP_TIMEOUT", 30)),
+    "pool_size": int(os.environ.get("BASALT_HTTP_POOL", 10)),
+    "concurrency": int(os.environ.get("BASALT_HTTP_CONCURRENCY", 10))
+}
+
+class HTTPResponse(dict):
+    # the cheap fields are filled in right away, body/json/content/raw only get decoded when asked for
+    lazy_keys = ("body", "json", "content", "raw")
+
+    def __init__(self, resp):
+        super().__init__(code=resp.status_code, url=resp.url, headers=resp.headers, ok=resp.ok, reason=resp.reason)
+        self.response = resp
+
+    def __missing__(self, key):
+        if key == "body":
+            value = self.response.text
+        elif key == "json":
+            try:
+                value = self.response.json()
+            except ValueError:
+                value = None # not json, don't blow up the whole script over it
+        elif key == "content":
+            value = self.response.content
+        elif key == "raw":
+            value = self.response.raw
+        else:
+            raise KeyError(key)
+        self[key] = value
+        return value
+
+    def materialize(self):
+        for key in self.lazy_keys:
+            self[key]
+
+    def get(self, key, default=None):
+        if key in self.lazy_keys:
+            return self[key]
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        return key in self.lazy_keys or super().__contains__(key)
+
+    def __iter__(self):
+        self.materialize()
+        return super().__iter__()
+
+    def __len__(self):
+        return len(super().keys() | set(self.lazy_keys))
+
+    def keys(self):
+        self.materialize()
+        return super().keys()
+
+    def values(self):
+        self.materialize()
+        return super().values()
+
+    def items(self):
+        self.materialize()
+        return super().items()
+
+class HTTPCache:
+    # in-memory lru in front of an optional on-disk store, keyed by method + url
+    def __init__(self, folder=None, size=256):
+        self.folder = folder
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+        self.lock = threading.Lock()
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.folder, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def lookup(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+        if not self.folder or not os.path.exists(self.path(key) + ".json"):
+            return None
+        try:
+            with open(self.path(key) + ".json", 'r') as f:
+                entry = json.load(f)
+            with open(self.path(key) + ".body", 'rb') as f:
+                entry["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        self.remember(key, entry)
+        return entry
+
+    def remember(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def store(self, key, entry):
+        self.remember(key, entry)
+        with self.lock:
+            self.stats["stores"] += 1
+        if not self.folder:
+            return
+        meta = {k: v for k, v in entry.items() if k != "body"}
+        path = self.path(key)
+        # write then rename, so a crash never leaves half an entry behind
+        with open(path + ".body.tmp", 'wb') as f:
+            f.write(entry["body"])
+        with open(path + ".json.tmp", 'w') as f:
+            json.dump(meta, f)
+        os.replace(path + ".body.tmp", path + ".body")
+        os.replace(path + ".json.tmp", path + ".json")
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+def cache_control(headers):
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+def http_expiry(headers, now):
+    directives = cache_control(headers)
+    if "no-cache" in directives:
+        return now
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return now + int(directives[name])
+    if headers.get("Expires"):
+        try:
+            return email.utils.parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now
+
+def http_cache_entry(resp, now, ttl):
+    headers = resp.headers
+    return {
+        "url": resp.url,
+        "code": resp.status_code,
+        "reason": resp.reason,
+        "headers": dict(headers),
+        "encoding": resp.encoding,
+        "stored": now,
+        "expires": now + ttl if ttl is not None else http_expiry(headers, now),
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "body": resp.content
+    }
+
+def cached_response(entry):
+    resp = requests.Response()
+    resp.status_code = entry["code"]
+    resp.reason = entry["reason"]
+    resp.url = entry["url"]
+    resp.encoding = entry["encoding"]
+    resp.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+    resp._content = entry["body"]
+    return resp
+
+class HTTPClient:
+    # http settings, session and cache for one run (see Context), so http timeout()/cache() don't leak into the next one
+    def __init__(self):
+        self.timeout = http_settings["timeout"]
+        self.concurrency = http_settings["concurrency"]
+        self.cache = None
+        self.connections = None
+        self.lock = threading.Lock()
+        if os.environ.get("BASALT_HTTP_CACHE"):
+            self.enable_cache(os.environ["BASALT_HTTP_CACHE"])
+
+    def __getstate__(self):
+        # worker processes get the settings, not the connections
+        return {"timeout": self.timeout, "concurrency": self.concurrency, "cache": self.cache.folder if self.cache else None, "cached": self.cache is not None}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.timeout = state["timeout"]
+        self.concurrency = state["concurrency"]
+        if state["cached"]:
+            self.enable_cache(state["cache"])
+
+    def session(self):
+        # one session per run so repeated requests reuse connections instead of redoing dns/tcp/tls
+        with self.lock:
+            if self.connections is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=http_settings["pool_size"], pool_maxsize=http_settings["pool_size"])
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.connections = session
+            return self.connections
+
+    def enable_cache(self, folder=None):
+        self.cache = HTTPCache(folder or None)
+        return self.cache
+
+    def request(self, method, url, ttl=None):
+        cache = self.cache
+        if cache is None or method.upper() != "GET":
+            resp = self.session().request(method.upper(), url, timeout=self.timeout)
+            return HTTPResponse(resp)
+        key = f"{method.upper()} {url}"
+        entry = cache.lookup(key)
+        now = time.time()
+        if entry is not None:
+            expires = entry["stored"] + ttl if ttl is not None else entry["expires"]
+            if now < expires:
+                cache.count("hits")
+                return HTTPResponse(cached_response(entry))
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = self.session().request("GET", url, headers=headers, timeout=self.timeout)
+        if entry is not None and resp.status_code == 304:
+            cache.count("revalidated")
+            entry = dict(entry)
+            entry["headers"] = dict(entry["headers"]) | dict(resp.headers)
+            entry["stored"] = now
+            entry["expires"] = now + ttl if ttl is not None else http_expiry(resp.headers, now)
+            cache.store(key, entry)
+            return HTTPResponse(cached_response(entry))
+        cache.count("misses")
+        directives = cache_control(resp.headers)
+        fresh_for_a_while = ttl is not None or http_expiry(resp.headers, now) > now
+        revalidatable = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        if resp.status_code == 200 and "no-store" not in directives and (fresh_for_a_while or revalidatable):
+            cache.store(key, http_cache_entry(resp, now, ttl))
+        return HTTPResponse(resp)
+
+    def request_many(self, batch, limit):
+        def fetch(item):
+            method, url = "get", item
+            if isinstance(item, dict):
+                method, url = item.get("method", "get"), item.get("url")
+            try:
+                return self.request(str(method), url)
+            except (requests.RequestException, ValueError) as e:
+                # one dead url shouldn't take the other results down with it
+                return {"code": None, "body": None, "json": None, "url": url, "headers": {}, "raw": None,
+                        "content": None, "ok": False, "reason": str(e), "error": str(e)}
+        if not batch:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(limit, len(batch)))) as pool:
+            return list(pool.map(fetch, batch))
+
+class TaskCancelled(Exception):
+    pass
+
+class Task:
+    def __init__(self, name):
+        self.name = name
+        self.future = None
+        self.cancelled = threading.Event()
+
+    def __repr__(self):
+        if self.cancelled.is_set():
+            state = "cancelled"
+        elif self.future.done():
+            state = "done"
+        else:
+            state = "running"
+        return f"<task '{self.name}' {state}>"
+
+    def cancel(self):
+        # tasks that haven't started yet just never run, running ones stop at their next block or wait()
+        self.cancelled.set()
+        self.future.cancel()
+
+task_local = threading.local()
+task_state = {"pool": None, "running": 0} # running: spawned tasks currently on a thread, nothing to cancel while it's 0
+task_lock = threading.Lock()
+
+def task_pool():
+    with task_lock:
+        if task_state["pool"] is None:
+            task_state["pool"] = concurrent.futures.ThreadPoolExecutor(max_workers=int(os.environ.get("BASALT_TASK_WORKERS", 32)), thread_name_prefix="basalt-task")
+        return task_state["pool"]
+
+def run_task(task, function, variables, functions, context):
+    task_local.task = task
+    with task_lock:
+        task_state["running"] += 1
+    try:
+        return Interpreter(function["tokens"], context=context).interpret(variables=variables, in_function=True, functions=functions, line=function["line"])
+    except BasaltError as e:
+        report_error(e, context.stdout) # say it right away, the task might never get awaited
+        raise
+    finally:
+        task_local.task = None
+        with task_lock:
+            task_state["running"] -= 1
+
+async def run_task_async(routine, context):
+    try:
+        return await drive_async(routine)
+    except BasaltError as e:
+        report_error(e, context.stdout)
+        raise
+
+def check_cancelled():
+    task = getattr(task_local, "task", None)
+    if task is not None and task.cancelled.is_set():
+        raise TaskCancelled()
+
+def pause(seconds):
+    task = getattr(task_local, "task", None)
+    if task is None:
+        time.sleep(seconds)
+    elif task.cancelled.wait(seconds):
+        raise TaskCancelled()
+
+class ChannelClosed(Exception):
+    pass
+
+CHANNEL_CLOSED = object()
+
+class Channel:
+    # bounded queue between tasks: send() waits while the channel is full, so a fast
+    # producer can't pile everything up in memory ahead of a slow consumer
+    def __init__(self, capacity, asynchronous):
+        self.capacity = capacity
+        self.closed = False
+        self.asynchronous = asynchronous
+        if asynchronous:
+            self.items = asyncio.Queue()
+            self.slots = asyncio.Semaphore(capacity)
+        else:
+            self.items = queue.Queue()
+            self.slots = threading.Semaphore(capacity)
+
+    def __repr__(self):
+        if self.closed:
+            return f"<channel {self.items.qsize() - 1}/{self.capacity} closed>"
+        return f"<channel {self.items.qsize()}/{self.capacity} open>"
+
+    def send(self, value):
+        if self.closed:
+            raise ChannelClosed()
+        self.slots.acquire()
+        if self.closed:
+            raise ChannelClosed()
+        self.items.put(value)
+
+    def recv(self):
+        item = self.items.get()
+        return self.received(item)
+
+    async def send_async(self, value):
+        if self.closed:
+            raise ChannelClosed()
+        await self.slots.acquire()
+        if self.closed:
+            raise ChannelClosed()
+        self.items.put_nowait(value)
+
+    async def recv_async(self):
+        item = await self.items.get()
+        return self.received(item)
+
+    def received(self, item):
+        if item is CHANNEL_CLOSED:
+            self.items.put_nowait(item) # leave it there for every other receiver too
+            return False, None
+        self.slots.release()
+        return True, item
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.items.put_nowait(CHANNEL_CLOSED)
+        for _ in range(self.capacity):
+            self.slots.release() # wake up senders stuck on a full channel so they can fail
+
+# Interpreter.run() is a generator that yields whenever it would block:
+#   ("sleep", seconds), ("io", function, args), ("join", task),
+#   ("send", channel, value) or ("recv", channel)
+# drive() does those right away in the current thread, drive_async() awaits them on an
+# event loop so other tasks can run in the meantime (--async)
+def perform(op):
+    if op[0] == "sleep":
+        pause(op[1])
+    elif op[0] == "io":
+        return op[1](*op[2])
+    elif op[0] == "join":
+        future = op[1].future
+        if "asyncio" in sys.modules and isinstance(future, asyncio.Future) and not future.done():
+            raise RuntimeError("can't wait on an --async task outside of the event loop")
+        return future.result()
+    elif op[0] == "send":
+        op[1].send(op[2])
+    elif op[0] == "recv":
+        return op[1].recv()
+
+def python_error(error):
+    # python blowing up somewhere in a script is still a basalt error, at the line the innermost interpreter was on
+    line = 1
+    frame = error.__traceback__
+    while frame is not None:
+        interpreter = frame.tb_frame.f_locals.get("self")
+        if isinstance(interpreter, Interpreter):
+            line = interpreter.line
+        frame = frame.tb_next
+    return BasaltError(f"{type(error).__name__}: {error}", line)
+
+def drive(routine):
+    value, error = None, None
+    while True:
+        try:
+            if error is None:
+                op = routine.send(value)
+            else:
+                op = routine.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        except (BasaltError, TaskCancelled):
+            raise
+        except Exception as e:
+            raise python_error(e) from e
+        value, error = None, None
+        try:
+            value = perform(op)
+        except Exception as e:
+            error = e
+
+async def perform_async(op):
+    if op[0] == "sleep":
+        await asyncio.sleep(op[1])
+    elif op[0] == "io":
+        return await asyncio.get_running_loop().run_in_executor(None, op[1], *op[2])
+    elif op[0] == "join":
+        future = op[1].future
+        if not isinstance(future, asyncio.Future):
+            future = asyncio.wrap_future(future)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future.cancelled():
+                raise TaskCancelled()
+            raise
+    elif op[0] in ("send", "recv"):
+        channel = op[1]
+        if channel.asynchronous:
+            if op[0] == "send":
+                return await channel.send_async(op[2])
+            return await channel.recv_async()
+        return await asyncio.get_running_loop().run_in_executor(None, perform, op)
+
+async def drive_async(routine):
+    value, error = None, None
+    while True:
+        try:
+            if error is None:
+                op = routine.send(value)
+            else:
+                op = routine.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        except (BasaltError, TaskCancelled):
+            raise
+        except Exception as e:
+            raise python_error(e) from e
+        value, error = None, None
+        try:
+            value = await perform_async(op)
+        except Exception as e:
+            error = e
+
+def run_async(interpreter, **kwargs):
+    async def main_task():
+        returned = await drive_async(interpreter.run(**kwargs))
+        # spawned tasks nobody awaited still get to finish, same as without --async
+        while True:
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            if not pending:
+                return returned
+            await asyncio.gather(*pending, return_exceptions=True)
+    return asyncio.run(main_task())
+
+def run_command(command, folder, capture):
+    # a string goes through the shell like before, a list is run as-is with no shell in between
+    shell = type(command) != list
+    if not shell:
+        command = [str(part) for part in command]
+    file_pool.flush_all() # the command should see whatever the script wrote so far
+    try:
+        result = subprocess.run(command, shell=shell, cwd=folder, capture_output=capture, text=capture)
+    except OSError as e:
+        if capture:
+            return {"stdout": "", "stderr": str(e), "code": 127}
+        print(e, file=sys.stderr)
+        return 127
+    if capture:
+        return {"stdout": result.stdout, "stderr": result.stderr, "code": result.returncode}
+    return result.returncode
+
+def run_commands(commands, folder, limit):
+    if not commands:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(limit, len(commands)))) as pool:
+        return list(pool.map(lambda command: run_command(command, folder, True), commands))
+
+parallel_state = {}
+
+def parallel_worker_init(tokens, line, variable, variables, functions, classes, context):
+    # runs once per worker process, so the loop body only gets shipped over once
+    variables = {name: pickle.loads(data) for name, data in variables.items()}
+    classes = {name: pickle.loads(data) for name, data in classes.items()}
+    parallel_state.update(tokens=tokens, line=line, variable=variable, variables=variables, functions=functions, classes=classes, context=context)
+
+def parallel_worker_run(chunk):
+    results = []
+    for item in chunk:
+        variables = {name: dict(record) for name, record in parallel_state["variables"].items()}
+        variables[parallel_state["variable"]] = {
+            "value": item,
+            "mutable": True
+        }
+        interpreter = Interpreter(parallel_state["tokens"], context=parallel_state["context"])
+        results.append(interpreter.interpret(variables=variables, functions=parallel_state["functions"], clses=parallel_state["classes"], in_function=True, line=parallel_state["line"]))
+    parallel_state["context"].close()
+    sys.stdout.flush()
+    return results
+
+def picklable(records):
+    # every record pickled once, here, the workers get the bytes; returns those and the names that couldn't be
+    snapshot = {}
+    unsent = []
+    for name, record in records.items():
+        try:
+            snapshot[name] = pickle.dumps(record)
+        except Exception:
+            unsent.append(name) # open files, tasks, responses etc. stay behind in the main process
+    return snapshot, unsent
+
+class Block(list):
+    # a block body without its newline tokens, lines[i] is the line tokens[i] was on
+    def __init__(self, tokens, lines):
+        super().__init__(tokens)
+        self.lines = lines
+
+class Scope(dict):
+    # variable/function/class table that also sees into modules imported with "as", without copying them in
+    # (tables start out as plain dicts, import ... as turns them into these)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namespaces = {}
+
+    def __missing__(self, key):
+        table = self.owner(key)
+        if table is self:
+            raise KeyError(key)
+        return table[key.split(".", 1)[1]]
+
+    def owner(self, key):
+        # the module table a qualified name lives in (or this table itself)
+        if type(key) == str and "." in key and not dict.__contains__(self, key):
+            alias = key.split(".", 1)[0]
+            if alias in self.namespaces:
+                return self.namespaces[alias]
+            raise KeyError(key)
+        return self
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        if type(key) != str or "." not in key:
+            return False
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        if type(key) != str or "." not in key:
+            return default
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
 class Interpreter:
-    def __init__(self, tokens, repl=False):
-        global argv
-        global parent_folder
+    def __init__(self, tokens, repl=False, context=None):
+        self.context = context or Context()
         self.tokens = tokens
+        self.lines = getattr(tokens, "lines", None)
         self.position = 0
-        self.current_token = self.tokens[self.position]
+        self.current_token = self.tokens[self.position] if self.tokens else None
         self.interfaces = {}
         self.variables = {
             "argv": {
-                "value": argv[1:],
+                "value": self.context.argv[1:],
                 "mutable": False
             },
             "argc": {
-                "value": argc - 2,
+                "value": len(self.context.argv),
                 "mutable": False
             },
             "null": {
@@ -241,9 +1294,20 @@ class Interpreter:
 
         }
         self.error_output = ""
-        self.line = 1
+        self._line = 1
         self.repl = repl
 
+    @property
+    def line(self):
+        # inside a block the line comes from the token we're on, everywhere else newlines count it
+        if self.lines:
+            return self.lines[min(self.position, len(self.lines) - 1)]
+        return self._line
+
+    @line.setter
+    def line(self, line):
+        self._line = line
+
     def advance(self):
         self.position += 1
         if self.position >= len(self.tokens):
@@ -266,17 +1330,13 @@ class Interpreter:
         return peeked
         
     def error(self, error_message, line):
-        red = colorama.Fore.RED
-        yellow = colorama.Fore.YELLOW
-        reset = colorama.Fore.RESET
-        print(f"{red}Error at line {yellow}{line}{red}: {error_message}{reset}")
         self.error_output = error_message
-        sys.exit(1)
+        raise BasaltError(error_message, line)
     
     def issue(self, issue_message, line):
         yellow = colorama.Fore.YELLOW
         reset = colorama.Fore.RESET
-        print(f"{yellow}Issue at line {line}: {issue_message}{reset}")
+        print(f"{yellow}Issue at line {line}: {issue_message}{reset}", file=self.context.stdout)
 
     def skip_block(self):
         brace_count = 0
@@ -340,15 +1400,17 @@ class Interpreter:
         evaluated = eval(parsed)
         return evaluated
 
-    def skip_block_function(self, name, params, line, class_method=False, tokens=[], indx=0, final=False):
+    def skip_block_function(self, name, params, line, class_method=False, tokens=[], indx=0, final=False, lines=[]):
         brace_count = 0
         if not class_method:
             function = []
+            function_lines = []
             while self.current_token is not None:
                 if self.current_token[0] == "NEWLINE":
                     self.line += 1
                 else:
                     function.append(self.current_token)
+                    function_lines.append(self.line)
                 if self.current_token[1] == "{":
                     brace_count += 1
                 elif self.current_token[1] == "}":
@@ -361,7 +1423,7 @@ class Interpreter:
                 if self.functions[name]["final"]:
                     self.error(f"cannot redefine @final function '{name}'", self.line)
             self.functions[name] = {
-                "tokens": function[1:-1],
+                "tokens": Block(function[1:-1], function_lines[1:-1]),
                 "params": params,
                 "line": line,
                 "final": final
@@ -370,6 +1432,7 @@ class Interpreter:
             self.advance()
         else:
             function_tokens = []
+            function_lines = []
             token = tokens[0]
             idx = 0
             brace_count = 1
@@ -379,6 +1442,7 @@ class Interpreter:
                     self.line += 1
                 else:
                     function_tokens.append(token)
+                    function_lines.append(lines[idx])
                 if token[1] == "{":
                     brace_count += 1
                 elif token[1] == "}":
@@ -391,16 +1455,103 @@ class Interpreter:
                     token = None
                     continue
                 token = tokens[idx]
-            return function_tokens[:-1], indx
+            return Block(function_tokens[:-1], function_lines[:-1]), indx
     
+    def call_arguments(self, function, parameters, snapshot=False):
+        variables = {}
+        idx = 0
+        for param in parameters:
+            if param[0] != "IDENTIFIER":
+                value = param[1]
+            else:
+                value = self.variables[param[1]]["value"]
+                if snapshot and type(value) in (list, dict):
+                    value = value.copy() # the task shouldn't see the caller mutating its arguments mid-run
+            variables[function["params"][idx]] = {
+                "value": value,
+                "mutable": True
+            }
+            idx += 1
+        return variables
+
+    def traced(self, name, routine, args=None):
+        # a function/method body that tells the hooks about itself, without hooks it's just the body
+        hooks = self.context.hooks
+        if hooks is None:
+            return routine
+        return self.hooked(hooks, name, routine, args)
+
+    def hooked(self, hooks, name, routine, args):
+        hooks.call(name, args)
+        value = None
+        try:
+            value = yield from routine
+            return value
+        finally:
+            hooks.ret(name, value)
+
+    def function_table(self, name):
+        # lib.fn (or fn from import ... only) runs with lib's own functions, so it can still call its helpers
+        module = self.functions[name].get("module")
+        if module is not None:
+            return module
+        if isinstance(self.functions, Scope):
+            return self.functions.owner(name)
+        return self.functions
+
+    def module_path(self, file):
+        # "lib/x.basalt" and "lib\\x.basalt" both work everywhere, relative to the script's folder
+        return os.path.abspath(os.path.join(self.context.parent_folder, os.path.normpath(file.replace("\\", "/"))))
+
+    def find_module(self, file):
+        path = self.module_path(file)
+        if os.path.isfile(path):
+            return path, compile_file(path)
+        name = os.path.normpath(file.replace("\\", "/")).replace(os.sep, "/")
+        for entry in search_path():
+            if os.path.isdir(entry):
+                path = os.path.abspath(os.path.join(entry, name))
+                if os.path.isfile(path):
+                    return path, compile_file(path)
+            elif os.path.isfile(entry):
+                try:
+                    archive = open_archive(entry)
+                except (OSError, ValueError) as e:
+                    self.error(f"can't read module archive: {e}", self.line)
+                if name in archive.index:
+                    return os.path.join(archive.path, name), archive.program(name)
+        self.error(f"can't import '{file}', file not found", self.line)
+
+    def load_module(self, file):
+        path, program = self.find_module(file)
+        if path not in self.context.imported:
+            self.context.imported.append(path)
+        cached = self.context.modules.get(path)
+        if cached and cached[0] is program:
+            return cached[1]
+        if path in self.context.loading:
+            chain = self.context.loading[self.context.loading.index(path):] + [path]
+            self.error(f"circular import ({' -> '.join(os.path.basename(p) for p in chain)})", self.line)
+        self.context.loading.append(path)
+        try:
+            interpreter = Interpreter(program.tokens, context=self.context)
+            exports = yield from interpreter.run(importing=True)
+        finally:
+            self.context.loading.pop()
+        self.context.modules[path] = (program, exports)
+        return exports
+
     def skip_block_repeat(self, amount):
         brace_count = 0
         repeat = []
+        lines = []
+        start = self.line
         while self.current_token is not None:
             if self.current_token[0] == "NEWLINE":
                 self.line += 1
             else:
                 repeat.append(self.current_token)
+                lines.append(self.line)
             if self.current_token[1] == "{":
                 brace_count += 1
             elif self.current_token[1] == "}":
@@ -410,9 +1561,11 @@ class Interpreter:
                     break
             self.advance()
         self.position -= 2
+        repeat = Block(repeat, lines)
+        run = self.runner()
         for _ in range(0, amount):
-            new_interpreter = Interpreter(repeat)
-            new_interpreter.interpret(variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line)
+            new_interpreter = Interpreter(repeat, context=self.context)
+            yield from run(new_interpreter, variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=start)
             if new_interpreter.broken:
                 break
         self.advance()
@@ -420,11 +1573,14 @@ class Interpreter:
     def skip_block_foreach(self, condition):
         brace_count = 0
         foreach = []
+        lines = []
+        start = self.line
         while self.current_token is not None:
             if self.current_token[0] == "NEWLINE":
                 self.line += 1
             else:
                 foreach.append(self.current_token)
+                lines.append(self.line)
             if self.current_token[1] == "{":
                 brace_count += 1
             elif self.current_token[1] == "}":
@@ -443,16 +1599,31 @@ class Interpreter:
         variable = left
         if variable[0] == "IDENTIFIER":
             variable = variable[1]
-        foreach = foreach[5:-1]
-        if type(right) == dict:
+        foreach = Block(foreach[5:-1], lines[5:-1])
+        run = self.runner()
+        if type(right) == Channel:
+            while True:
+                received, value = yield ("recv", right)
+                if not received:
+                    break
+                variables = self.variables
+                variables[variable] = {
+                    "value": value,
+                    "mutable": True
+                }
+                new_interpreter = Interpreter(foreach, context=self.context)
+                yield from run(new_interpreter, variables=variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=start)
+                if new_interpreter.broken:
+                    break
+        elif isinstance(right, dict):
             for key,value in right.items():
                 variables = self.variables
                 variables[variable] = {
                     "value": [key,value],
                     "mutable": True
                 }
-                new_interpreter = Interpreter(foreach)
-                new_interpreter.interpret(variables=variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line)
+                new_interpreter = Interpreter(foreach, context=self.context)
+                yield from run(new_interpreter, variables=variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=start)
                 if new_interpreter.broken:
                     break
         else:
@@ -462,20 +1633,103 @@ class Interpreter:
                     "value": i,
                     "mutable": True
                 }
-                new_interpreter = Interpreter(foreach)
-                new_interpreter.interpret(variables=variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line)
+                new_interpreter = Interpreter(foreach, context=self.context)
+                yield from run(new_interpreter, variables=variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=start)
                 if new_interpreter.broken:
                     break
         self.advance()
     
+    def skip_block_parallel_foreach(self):
+        self.advance()
+        if self.current_token != ("KEYWORD", "foreach"):
+            self.error("expected foreach after parallel (parallel foreach [var] in [list] -> [results] { })", self.line)
+        self.advance()
+        variable = self.current_token
+        if variable[0] != "IDENTIFIER":
+            self.error(f"invalid foreach variable '{variable[1]}'", self.line)
+        self.advance()
+        if self.current_token != ("KEYWORD", "in"):
+            self.error("missing 'in' keyword between foreach values (shocking, i know)", self.line)
+        self.advance()
+        right = self.current_token
+        if right[0] == "IDENTIFIER":
+            right = self.variables[right[1]]["value"]
+        else:
+            right = right[1]
+        self.advance()
+        output = None
+        if self.current_token == ("RETURN_OPERATOR", "->"):
+            self.advance()
+            output = self.current_token
+            if output[0] != "IDENTIFIER":
+                self.error(f"invalid variable '{output[1]}' to collect parallel foreach results in", self.line)
+            if not self.variables[output[1]]["mutable"]:
+                self.error(f"cannot change value of immutable variable '{output[1]}'", self.line)
+            self.advance()
+        if self.current_token != ("CURLY", "{"):
+            self.error("missing opening curly brace for parallel foreach", self.line)
+        brace_count = 0
+        body = []
+        lines = []
+        start = self.line
+        while self.current_token is not None:
+            if self.current_token[0] == "NEWLINE":
+                self.line += 1
+            else:
+                body.append(self.current_token)
+                lines.append(self.line)
+            if self.current_token[1] == "{":
+                brace_count += 1
+            elif self.current_token[1] == "}":
+                brace_count -= 1
+                if brace_count == 0:
+                    self.advance()
+                    break
+            self.advance()
+        body = Block(body[1:-1], lines[1:-1])
+        if isinstance(right, dict):
+            items = [[key, value] for key, value in right.items()]
+        else:
+            items = list(right)
+        workers = int(os.environ.get("BASALT_WORKERS", os.cpu_count() or 1))
+        workers = max(1, min(workers, len(items)))
+        chunk_size = max(1, -(-len(items) // (workers * 4)))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = []
+        if chunks:
+            # otherwise forked workers inherit (and write out again) whatever is still buffered
+            sys.stdout.flush()
+            file_pool.flush_all()
+            variables, unsent = picklable(self.variables)
+            classes, unsent_classes = picklable(self.classes)
+            used = {token[1] for token in body if token[0] == "IDENTIFIER"}
+            strings = [token[1] for token in body if token[0] == "STRING"]
+            for name in unsent + unsent_classes:
+                if name in used or any(f"[{name}]" in string for string in strings):
+                    self.error(f"can't send '{name}' to the parallel foreach workers (open files, tasks, channels and the like stay in the main process)", start)
+            initargs = (body, start, variable[1], variables, self.functions, classes, self.context)
+            try:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=parallel_worker_init, initargs=initargs) as pool:
+                    for chunk in pool.map(parallel_worker_run, chunks):
+                        results.extend(chunk)
+            except BasaltError:
+                raise
+            except Exception as e:
+                self.error(f"parallel foreach failed: {e}", self.line)
+        if output:
+            self.variables[output[1]]["value"] = results
+
     def skip_block_while(self, condition):
         brace_count = 0
         repeat = []
+        lines = []
+        start = self.line
         while self.current_token is not None:
             if self.current_token[0] == "NEWLINE":
                 self.line += 1
             else:
                 repeat.append(self.current_token)
+                lines.append(self.line)
             if self.current_token[1] == "{":
                 brace_count += 1
             elif self.current_token[1] == "}":
@@ -485,9 +1739,11 @@ class Interpreter:
                     break
             self.advance()
         self.position -= 2
+        repeat = Block(repeat, lines)
+        run = self.runner()
         while self.parse_condition(condition):
-            new_interpreter = Interpreter(repeat)
-            new_interpreter.interpret(variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line)
+            new_interpreter = Interpreter(repeat, context=self.context)
+            yield from run(new_interpreter, variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=start)
             if new_interpreter.broken:
                 break
         self.advance()
@@ -495,11 +1751,13 @@ class Interpreter:
     def skip_block_class(self, name, params, line, inheriting=None, interfacing=None):
         brace_count = 0
         class_ = []
+        class_lines = []
         while self.current_token is not None:
             if self.current_token[0] == "NEWLINE":
                 self.line += 1
             else:
                 class_.append(self.current_token)
+                class_lines.append(self.line)
             if self.current_token[1] == "{":
                 brace_count += 1
             elif self.current_token[1] == "}":
@@ -534,7 +1792,7 @@ class Interpreter:
                         idx += 1
                         break
                     idx += 1
-                method, idx = self.skip_block_function(nam, pars, 0, class_method=True, tokens=class_[idx:], indx=idx)
+                method, idx = self.skip_block_function(nam, pars, 0, class_method=True, tokens=class_[idx:], indx=idx, lines=class_lines[idx:])
                 methods[nam] = {"tokens": method, "params": pars}
             else:
                 idx += 1
@@ -573,7 +1831,29 @@ class Interpreter:
         self.position -= 2
         self.advance()
     
-    def interpret(self, variables=None, functions=None, clses=None, class_vars=None, line=None, in_function=False, importing=False, cls=False, classe=None, interfs=None):
+    def interpret(self, *args, **kwargs):
+        return drive(self.run(*args, **kwargs))
+
+    def run(self, *args, **kwargs):
+        # generator version of interpret(): yields whenever it has to wait on something (see drive()/drive_async())
+        # blocks and function calls yield from this straight into execute(), unless there are hooks to tell
+        hooks = self.context.hooks
+        if hooks is None:
+            return self.execute(*args, **kwargs)
+        return self.entered(hooks, *args, **kwargs)
+
+    def runner(self):
+        # what loop bodies and calls yield from: execute() itself unless there are hooks to tell about the new block
+        return Interpreter.execute if self.context.hooks is None else Interpreter.run
+
+    def entered(self, hooks, *args, **kwargs):
+        hooks.enter(kwargs.get("line") or self.line)
+        try:
+            return (yield from self.execute(*args, **kwargs))
+        finally:
+            hooks.leave()
+
+    def execute(self, variables=None, functions=None, clses=None, class_vars=None, line=None, in_function=False, importing=False, cls=False, classe=None, interfs=None):
         if variables:
             self.variables = variables
         if functions:
@@ -585,17 +1865,36 @@ class Interpreter:
         if interfs:
             self.interfaces = interfs
         if line:
-            self.line = line
+            self._line = line
+        if task_state["running"]:
+            check_cancelled()
+        hooks = self.context.hooks # looked up once per frame, so no hooks means one local check per line
+        if hooks is not None and line is None and not cls and self.lines is None and self.current_token is not None:
+            hooks.statement(self.line, self.current_token) # a whole script or module, nothing before line 1 announces it
+        block_lines = self.lines if hooks is not None else None # blocks have no newlines, so the hooks hear about a line when its first token comes up
+        last_line = line
         while self.current_token is not None:
+            if block_lines is not None and block_lines[self.position] != last_line:
+                last_line = block_lines[self.position]
+                hooks.statement(last_line, self.current_token)
+            if self.current_token[0] == "NEWLINE":
+                # nothing can change a variable's type between two lines, so newlines skip the check below
+                self.line += 1
+                if hooks is not None:
+                    hooks.statement(self.line, self.peek())
+                self.advance()
+                continue
             for variable, value in self.variables.items():
                 if value.get("type"):
                     if type(value["value"]).__name__ != value.get("type"):
                         self.error(f"'{variable}' variable's value type changed, but type annotation restricts value of '{variable}' to be {value.get('type')}", self.line)
             current_token_type = self.current_token[0]
             current_token_value = self.current_token[1]
-            if current_token_type == "NEWLINE":
-                self.line += 1
-            elif current_token_type == "KEYWORD":
+            if current_token_type == "IDENTIFIER" and current_token_value in STATEMENT_WORDS and self.peek() is not None and STATEMENT_WORDS[current_token_value](self.peek()):
+                current_token_type = "KEYWORD"
+            if current_token_type == "KEYWORD":
+                if hooks is not None:
+                    hooks.keyword(current_token_value)
                 if current_token_value in ("print", "println", "printf"):
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     if next_token_type == "PARENTHESIS" and next_token_value == "(":
@@ -632,7 +1931,7 @@ class Interpreter:
                                                     list_string = list_string[:-1]
                                                 list_string += "]"
                                                 value = list_string
-                                            elif type(value) == dict:
+                                            elif isinstance(value, dict):
                                                 dict_string = "{"
                                                 for k,v in value.items():
                                                     if type(v) == str:
@@ -653,7 +1952,7 @@ class Interpreter:
                                         new_string += char
                                     idx += 1
                                 print_value = new_string
-                            print(print_value, end=ending)
+                            print(print_value, end=ending, file=self.context.stdout)
                         else:
                             self.error("you can't print a variable name directly, you have to put it in a format print ('printf(\"[variable_name]\")')", self.line)
                     else:
@@ -776,7 +2075,7 @@ class Interpreter:
                         input_prompt = self.variables[next_token_value]["value"]
                     next_token_type, next_token_value = self.peek(3)[0], self.peek(3)[1]
                     if next_token_type == "PARENTHESIS" and next_token_value == ")":
-                        input(input_prompt)
+                        yield ("io", self.context.input, (input_prompt,))
                         self.advance()
                         continue
                     else:
@@ -788,7 +2087,7 @@ class Interpreter:
                         next_token_type, next_token_value = self.peek(4)[0], self.peek(4)[1]
                         if next_token_type != "PARENTHESIS" and next_token_value != ")":
                             self.error("missing closing parenthesis for input() function", self.line)
-                        self.variables[variable_name]["value"] = input(input_prompt)
+                        self.variables[variable_name]["value"] = yield ("io", self.context.input, (input_prompt,))
                 elif current_token_value == "clear":
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     if next_token_type != "PARENTHESIS" and next_token_value != "(":
@@ -796,7 +2095,10 @@ class Interpreter:
                     next_token_type, next_token_value = self.peek(2)[0], self.peek(2)[1]
                     if next_token_type != "PARENTHESIS" and next_token_value != ")":
                         self.error("missing closing parenthesis for clear() function", self.line)
-                    os.system('cls' if os.name == 'nt' else 'clear')
+                    if self.context.stdout is None:
+                        os.system('cls' if os.name == 'nt' else 'clear')
+                    else:
+                        self.context.stdout.write("\033[2J\033[H")
                 elif current_token_value == "wait":
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     if next_token_type != "PARENTHESIS" and next_token_value != "(":
@@ -809,9 +2111,9 @@ class Interpreter:
                         variable_value = self.variables[variable_name]["value"]
                         if type(variable_value) != int:
                             self.error(f"invalid waiting time '{variable_value}' for wait function (expects an integer of milliseconds)", self.line)
-                        time.sleep(variable_value / 1000)
+                        yield ("sleep", variable_value / 1000)
                     elif next_token_type == "NUMBER":
-                        time.sleep(next_token_value / 1000)
+                        yield ("sleep", next_token_value / 1000)
                     else:
                         self.error("missing closing parenthesis for wait() function", self.line)
                 elif current_token_value == "exit":
@@ -820,15 +2122,15 @@ class Interpreter:
                         self.error("missing opening parenthesis for exit() function", self.line)
                     next_token_type, next_token_value = self.peek(2)[0], self.peek(2)[1]
                     if next_token_type == "PARENTHESIS" and next_token_value == ")":
-                        sys.exit(0)
+                        raise BasaltExit(0, self.line)
                     elif next_token_type == "IDENTIFIER":
                         variable_name = next_token_value
                         variable_value = self.variables[variable_name]["value"]
                         if type(variable_value) != int:
                             self.error(f"invalid error code '{variable_value}' for exit() function (expects an integer)", self.line)
-                        sys.exit(variable_value)
+                        raise BasaltExit(variable_value, self.line)
                     elif next_token_type == "NUMBER":
-                        sys.exit(next_token_value)
+                        raise BasaltExit(next_token_value, self.line)
                     else:
                         self.error("missing closing parenthesis for exit() function", self.line)
                 elif current_token_value == "if":
@@ -927,22 +2229,11 @@ class Interpreter:
                                 parameters = self.peek_until(("SQUARE", "]"))
                             elif next_token[0] == "PARENTHESIS":
                                 parameters = self.peek_until(("PARENTHESIS", ")")) 
-                            idx = 0
-                            for param in parameters:
-                                if param[0] != "IDENTIFIER":
-                                    variables[function["params"][idx]] = {
-                                        "value": param[1],
-                                        "mutable": True
-                                    }
-                                else:
-                                    variables[function["params"][idx]] = {
-                                        "value": self.variables[param[1]]["value"],
-                                        "mutable": True
-                                    }
-                                idx += 1
+                            variables = self.call_arguments(function, parameters)
                             parenned=True
-                    new_interpreter = Interpreter(function["tokens"])
-                    returned = new_interpreter.interpret(variables=variables, in_function=True, functions=self.functions)
+                    new_interpreter = Interpreter(function["tokens"], context=self.context)
+                    run = self.runner()
+                    returned = yield from self.traced(function_value, run(new_interpreter, variables=variables, in_function=True, functions=self.function_table(function_value), line=function["line"]), variables)
                     if not parenned:
                         self.advance()
                     next_token = self.peek()
@@ -970,6 +2261,137 @@ class Interpreter:
                                 if not self.variables[value]["mutable"]:
                                     self.error(f"cannot change value of immutable variable '{value}'", self.line)
                                 self.variables[value]["value"] = returned
+                elif current_token_value == "spawn":
+                    self.advance()
+                    if self.current_token != ("KEYWORD", "call"):
+                        self.error("expected call after spawn (spawn call [function]([args]) -> [handle])", self.line)
+                    self.advance()
+                    function_type, function_value = self.current_token[0], self.current_token[1]
+                    if function_type != "IDENTIFIER" or function_value not in self.functions:
+                        self.error(f"invalid function '{function_value}' being spawned", self.line)
+                    function = self.functions[function_value]
+                    variables = {}
+                    next_token = self.peek()
+                    if next_token in (("SQUARE", "["), ("PARENTHESIS", "(")):
+                        self.advance()
+                        self.advance()
+                        if next_token[0] == "SQUARE":
+                            parameters = self.peek_until(("SQUARE", "]"))
+                        else:
+                            parameters = self.peek_until(("PARENTHESIS", ")"))
+                        variables = self.call_arguments(function, parameters, snapshot=True)
+                    if self.peek() != ("RETURN_OPERATOR", "->"):
+                        self.error("expected -> [handle] after spawned function call", self.line)
+                    self.advance()
+                    self.advance()
+                    handle = self.current_token
+                    if handle[0] != "IDENTIFIER":
+                        self.error(f"invalid variable '{handle[1]}' getting passed as task handle", self.line)
+                    if not self.variables[handle[1]]["mutable"]:
+                        self.error(f"cannot change value of immutable variable '{handle[1]}'", self.line)
+                    task = Task(function_value)
+                    loop = running_loop()
+                    if loop is not None:
+                        # --async: the task is just another coroutine on the loop, no thread of its own
+                        task.future = loop.create_task(run_task_async(Interpreter(function["tokens"], context=self.context).run(variables=variables, in_function=True, functions=self.function_table(function_value), line=function["line"]), self.context))
+                    else:
+                        task.future = task_pool().submit(run_task, task, function, variables, self.function_table(function_value), self.context)
+                    self.variables[handle[1]]["value"] = task
+                elif current_token_value == "await":
+                    self.advance()
+                    task = self.current_token
+                    if task[0] != "IDENTIFIER":
+                        self.error(f"invalid task handle '{task[1]}' passed to await", self.line)
+                    task = self.variables[task[1]]["value"]
+                    if type(task) != Task:
+                        self.error(f"can't await '{task}', it's not a task handle (spawn call [function] -> [handle])", self.line)
+                    returned = None
+                    try:
+                        returned = yield ("join", task)
+                    except (concurrent.futures.CancelledError, asyncio.CancelledError, TaskCancelled):
+                        self.issue(f"awaited task '{task.name}' was cancelled", self.line)
+                    except BasaltError as e:
+                        # the task already said what went wrong (and where) when it failed, this is where the script finds out
+                        raise BasaltError(f"task '{task.name}' failed: {e.message}", self.line, code=e.code) from e
+                    except Exception as e:
+                        self.error(f"task '{task.name}' failed: {e}", self.line)
+                    if self.peek() == ("RETURN_OPERATOR", "->"):
+                        self.advance()
+                        self.advance()
+                        variable = self.current_token
+                        if variable[0] != "IDENTIFIER":
+                            self.error(f"invalid variable '{variable[1]}' getting passed as return variable in await", self.line)
+                        if not self.variables[variable[1]]["mutable"]:
+                            self.error(f"cannot change value of immutable variable '{variable[1]}'", self.line)
+                        self.variables[variable[1]]["value"] = returned
+                elif current_token_value == "cancel":
+                    next = self.peek()
+                    if next != ("PARENTHESIS", "("):
+                        self.error("missing opening parenthesis for cancel() function", self.line)
+                    next = self.peek(3)
+                    if next != ("PARENTHESIS", ")"):
+                        self.error("missing closing parenthesis for cancel() function", self.line)
+                    task = self.peek(2)
+                    if task[0] != "IDENTIFIER" or type(self.variables[task[1]]["value"]) != Task:
+                        self.error(f"invalid task handle '{task[1]}' passed to cancel()", self.line)
+                    self.variables[task[1]]["value"].cancel()
+                elif current_token_value == "channel":
+                    self.advance()
+                    command = self.current_token
+                    if command[1] not in ("new", "send", "recv", "close"):
+                        self.error(f"inexistent channel function '{command[1]}'", self.line)
+                    command = command[1]
+                    self.advance()
+                    if self.current_token != ("PARENTHESIS", "("):
+                        self.error("missing opening parenthesis for channel function", self.line)
+                    args = []
+                    while self.peek() is not None and self.peek() != ("PARENTHESIS", ")"):
+                        self.advance()
+                        args.append(self.current_token)
+                    if self.peek() is None:
+                        self.error("missing closing parenthesis for channel function", self.line)
+                    if len(args) != (1 if command == "close" else 2):
+                        self.error(f"wrong number of arguments for channel {command}() function", self.line)
+                    if command == "new":
+                        capacity = args[0]
+                        if capacity[0] == "IDENTIFIER":
+                            capacity = self.variables[capacity[1]]["value"]
+                        else:
+                            capacity = capacity[1]
+                        if type(capacity) != int or capacity < 1:
+                            self.error(f"invalid channel capacity '{capacity}' (expects a positive integer)", self.line)
+                        variable = args[1]
+                        if variable[0] != "IDENTIFIER":
+                            self.error("expected variable to store the new channel in", self.line)
+                        if not self.variables[variable[1]]["mutable"]:
+                            self.error(f"cannot change value of immutable variable '{variable[1]}'", self.line)
+                        asynchronous = running_loop() is not None
+                        self.variables[variable[1]]["value"] = Channel(capacity, asynchronous)
+                        continue
+                    channel = args[0]
+                    if channel[0] != "IDENTIFIER" or type(self.variables[channel[1]]["value"]) != Channel:
+                        self.error(f"expected channel as first argument to channel {command}() function", self.line)
+                    channel = self.variables[channel[1]]["value"]
+                    if command == "send":
+                        value = args[1]
+                        if value[0] == "IDENTIFIER":
+                            value = self.variables[value[1]]["value"]
+                        else:
+                            value = value[1]
+                        try:
+                            yield ("send", channel, value)
+                        except ChannelClosed:
+                            self.error("can't send to a closed channel", self.line)
+                    elif command == "recv":
+                        variable = args[1]
+                        if variable[0] != "IDENTIFIER":
+                            self.error("expected variable to receive the channel value in", self.line)
+                        if not self.variables[variable[1]]["mutable"]:
+                            self.error(f"cannot change value of immutable variable '{variable[1]}'", self.line)
+                        received, value = yield ("recv", channel)
+                        self.variables[variable[1]]["value"] = value
+                    elif command == "close":
+                        channel.close()
                 elif current_token_value == "return":
                     to_return = self.peek()
                     type_ = to_return[0]
@@ -1003,44 +2425,101 @@ class Interpreter:
                     self.advance()
                     if repeat_type == "IDENTIFIER":
                         repeat_value = self.variables[repeat_value]["value"]
-                    self.skip_block_repeat(repeat_value)
+                    yield from self.skip_block_repeat(repeat_value)
                 elif current_token_value == "foreach":
                     condition = [self.peek(), self.peek(2), self.peek(3)]
-                    self.skip_block_foreach(condition)
+                    yield from self.skip_block_foreach(condition)
+                elif current_token_value == "parallel":
+                    self.skip_block_parallel_foreach()
+                    continue
                 elif current_token_value == "while":
                     condition = self.peek_until(("CURLY", "{"))
-                    self.skip_block_while(condition)
+                    yield from self.skip_block_while(condition)
                 elif current_token_value == "file":
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     self.advance()
-                    if next_token_type != "KEYWORD":
+                    if next_token_type != "KEYWORD" and next_token_value not in ("map", "slice", "find", "line", "open", "close"):
                         self.error("what... what the fuck are you doing... with file I/O...? im scared...", self.line)
                     type_ = next_token_value
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     self.advance()
                     if next_token_type != "PARENTHESIS" and next_token_type != "(":
                         self.error("missing opening parenthesis for file function", self.line)
-                    next_token_type, next_token_value = self.peek(3)[0], self.peek(3)[1]
-                    if next_token_type != "PARENTHESIS" and next_token_type != ")":
+                    closing = 3
+                    if type_ in ("open", "close"):
+                        closing = 2
+                    next_token_type, next_token_value = self.peek(closing)[0], self.peek(closing)[1]
+                    if next_token_type != "PARENTHESIS" and next_token_type != ")" and type_ not in ("slice", "find", "line"):
                         self.error("missing closing parenthesis for file function", self.line)
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     self.advance()
                     if next_token_type == "IDENTIFIER":
                         next_token_value = self.variables[next_token_value]["value"]
                     file = next_token_value
-                    file = os.path.join(parent_folder, os.path.basename(file))
-                    if type_ == "write":
+                    if type_ in ("slice", "find", "line"):
+                        mapped = file
+                        if type(mapped) != MappedFile:
+                            self.error(f"file {type_}() expects a mapped file (from file map()) as first argument", self.line)
+                        if mapped.closed:
+                            self.error(f"'{os.path.basename(mapped.path)}' was written to after it got mapped, map it again", self.line)
+                        args = []
+                        while self.peek() is not None and self.peek() != ("PARENTHESIS", ")"):
+                            next_token_type, next_token_value = self.peek()[0], self.peek()[1]
+                            self.advance()
+                            args.append((next_token_type, next_token_value))
+                        variable_output = args[-1]
+                        if variable_output[0] != "IDENTIFIER":
+                            self.error(f"expected variable to return file {type_}() value to", self.line)
+                        if not self.variables[variable_output[1]]["mutable"]:
+                            self.error(f"cannot change value of immutable variable '{variable_output[1]}'", self.line)
+                        values = []
+                        for arg in args[:-1]:
+                            if arg[0] == "IDENTIFIER":
+                                values.append(self.variables[arg[1]]["value"])
+                            else:
+                                values.append(arg[1])
+                        if type_ == "slice":
+                            if len(values) != 2:
+                                self.error("file slice() expects a mapped file, a start, an end and a variable", self.line)
+                            value = mapped[values[0]:values[1]]
+                        elif type_ == "find":
+                            if len(values) not in (1, 2) or type(values[0]) != str:
+                                self.error("file find() expects a mapped file, a string to look for, an optional start and a variable", self.line)
+                            value = mapped.find(*values)
+                        elif type_ == "line":
+                            if len(values) != 1 or type(values[0]) != int:
+                                self.error("file line() expects a mapped file, a line number and a variable", self.line)
+                            value = mapped.line(values[0])
+                        self.variables[variable_output[1]]["value"] = value
+                        self.advance()
+                        continue
+                    file = os.path.join(self.context.parent_folder, os.path.basename(file))
+                    if type_ == "map":
+                        next_token_type, next_token_value = self.peek()[0], self.peek()[1]
+                        self.advance()
+                        if next_token_type != "IDENTIFIER":
+                            self.error("expected variable to store the mapped file in", self.line)
+                        variable = self.variables[next_token_value]
+                        if not variable["mutable"]:
+                            self.error(f"cannot change value of immutable variable '{next_token_value}'", self.line)
+                        if not os.path.exists(file):
+                            self.error(f"can't map inexistent file '{os.path.basename(file)}'", self.line)
+                        file_pool.flush(file)
+                        variable["value"] = MappedFile(file)
+                        self.context.mapped.append(variable["value"])
+                    elif type_ == "write":
                         next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                         self.advance()
                         if next_token_type == "IDENTIFIER":
                             next_token_value = self.variables[next_token_value]["value"]
                         text_to_write = str(next_token_value)
-                        with open(file, 'w') as f:
-                            f.write(text_to_write)
+                        unmap(file)
+                        file_pool.write(file, text_to_write)
                     elif type_ == "read":
                         next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                         self.advance()
                         variable_output = next_token_value
+                        file_pool.flush(file)
                         with open(file, 'r') as f:
                             variable = self.variables[variable_output]
                             if not variable["mutable"]:
@@ -1052,23 +2531,62 @@ class Interpreter:
                         if next_token_type == "IDENTIFIER":
                             next_token_value = self.variables[next_token_value]["value"]
                         text_to_write = next_token_value
-                        with open(file, 'a') as f:
-                            f.write(text_to_write)
+                        file_pool.append(file, text_to_write)
+                    elif type_ == "open":
+                        file_pool.open(file)
+                    elif type_ == "close":
+                        file_pool.close(file)
                 elif current_token_value == "system":
+                    batch = False
+                    if self.peek() == ("IDENTIFIER", "batch"):
+                        batch = True
+                        self.advance()
                     next_token_type, next_token_value = self.peek()[0], self.peek()[1]
                     self.advance()
                     if next_token_type != "PARENTHESIS" and next_token_value != "(":
                         self.error("missing opening parenthesis for system() function", self.line)
-                    next_token_type, next_token_value = self.peek(2)[0], self.peek(2)[1]
-                    if next_token_type != "PARENTHESIS" and next_token_value != ")":
+                    args = []
+                    while self.peek() is not None and self.peek() != ("PARENTHESIS", ")"):
+                        self.advance()
+                        args.append(self.current_token)
+                    if self.peek() is None:
                         self.error("missing closing parenthesis for system() function", self.line)
-                    next_token_type, next_token_value = self.peek()[0], self.peek()[1]
-                    self.advance()
-                    if next_token_type == "IDENTIFIER":
-                        next_token_value = self.variables[next_token_value]["value"]
-                    command = next_token_value
-                    cd_command = os.path.dirname(os.path.abspath(argv[1]))
-                    subprocess.run(f"cd {cd_command} && {command}", shell=True, capture_output=False)
+                    if len(args) not in ((2, 3) if batch else (1, 2)):
+                        if batch:
+                            self.error("system batch() expects a list of commands, an output variable and an optional process limit", self.line)
+                        self.error("system() expects a command and an optional output variable", self.line)
+                    command = args[0]
+                    if command[0] == "IDENTIFIER":
+                        command = self.variables[command[1]]["value"]
+                    else:
+                        command = command[1]
+                    output = None
+                    if len(args) > 1:
+                        output = args[1]
+                        if output[0] != "IDENTIFIER":
+                            self.error(f"can't store command output in '{output[1]}', output must go into a variable", self.line)
+                        if not self.variables[output[1]]["mutable"]:
+                            self.error(f"cannot change value of immutable variable '{output[1]}'", self.line)
+                    folder = self.context.parent_folder
+                    if batch:
+                        if type(command) != list:
+                            self.error("expected list of commands as first argument to system batch() function", self.line)
+                        limit = os.cpu_count() or 1
+                        if len(args) == 3:
+                            limit = args[2]
+                            if limit[0] == "IDENTIFIER":
+                                limit = self.variables[limit[1]]["value"]
+                            else:
+                                limit = limit[1]
+                            if type(limit) != int or limit < 1:
+                                self.error(f"invalid process limit '{limit}' for system batch() function (expects a positive integer)", self.line)
+                        result = yield ("io", run_commands, (command, folder, limit))
+                    else:
+                        if type(command) not in (str, list):
+                            self.error(f"invalid command '{command}' for system() function (expects a string or a list of arguments)", self.line)
+                        result = yield ("io", run_command, (command, folder, output is not None))
+                    if output is not None:
+                        self.variables[output[1]]["value"] = result
                 elif current_token_value == "string":
                     self.advance()
                     next_value = self.current_token[1]
@@ -1428,16 +2946,49 @@ class Interpreter:
                 elif current_token_value == "import":
                     file = self.peek()
                     if file[0] == "IDENTIFIER":
-                        file = self.variables[file]["value"]
+                        file = self.variables[file[1]]["value"]
                     elif file[0] == "STRING":
                         file = file[1]
                     else:
                         self.error(f"invalid argument '{file[1]}' passed to import", self.line)
-                    with open(parent_folder + "\\" + file, 'r') as f:
-                        lexer = Lexer(f.read(), keywords=keywords)
-                        tokens = lexer.tokenize()
-                        interpreter = Interpreter(tokens)
-                        vars_, funcs, classes, class_vars, interfaces = interpreter.interpret(importing=True)
+                    exports = yield from self.load_module(file)
+                    mode = self.peek(2)
+                    if mode == ("IDENTIFIER", "as"):
+                        # import "lib.basalt" as lib -> lib.name, nothing gets copied
+                        alias = self.peek(3)
+                        if alias is None or alias[0] != "IDENTIFIER" or "." in alias[1]:
+                            self.error("expected a module name after 'as'", self.line)
+                        for kind in ("variables", "functions", "classes", "class_variables", "interfaces"):
+                            if not isinstance(getattr(self, kind), Scope):
+                                setattr(self, kind, Scope(getattr(self, kind)))
+                        for table, exported in zip((self.variables, self.functions, self.classes, self.class_variables, self.interfaces), exports):
+                            table.namespaces[alias[1]] = exported
+                        self.advance()
+                        self.advance()
+                    elif mode == ("IDENTIFIER", "only"):
+                        # import "lib.basalt" only (a b c) -> just those names
+                        self.advance()
+                        self.advance()
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", "("):
+                            self.error("missing opening parenthesis for import only", self.line)
+                        self.advance()
+                        names = self.peek_until(("PARENTHESIS", ")"))
+                        for name in names:
+                            if name[0] != "IDENTIFIER":
+                                self.error(f"invalid name '{name[1]}' passed to import only", self.line)
+                            found = False
+                            for table, exported in zip((self.variables, self.functions, self.classes, self.class_variables, self.interfaces), exports):
+                                if name[1] in exported:
+                                    table[name[1]] = exported[name[1]]
+                                    if table is self.functions:
+                                        # still runs with the module's functions, so it can call helpers that weren't imported
+                                        table[name[1]] = exported[name[1]] | {"module": exported}
+                                    found = True
+                            if not found:
+                                self.error(f"'{name[1]}' isn't defined in '{file}'", self.line)
+                    else:
+                        vars_, funcs, classes, class_vars, interfaces = exports
                         self.variables |= vars_
                         self.functions |= funcs
                         self.classes |= classes
@@ -1670,8 +3221,8 @@ class Interpreter:
                                         elif self.current_token == ("CURLY", "{"):
                                             curly_count += 1
                                         self.advance()
-                                    new = Interpreter(tokens)
-                                    new.interpret(variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line, interfs=self.interfaces)
+                                    new = Interpreter(tokens, context=self.context)
+                                    yield from new.run(variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line, interfs=self.interfaces)
                                     break
                             elif self.peek(-1) == ("KEYWORD", "default"):
                                 tokens = []
@@ -1686,8 +3237,8 @@ class Interpreter:
                                     elif self.current_token == ("CURLY", "{"):
                                         curly_count += 1
                                     self.advance()
-                                new = Interpreter(tokens)
-                                new.interpret(variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line, interfs=self.interfaces)
+                                new = Interpreter(tokens, context=self.context)
+                                yield from new.run(variables=self.variables, functions=self.functions, clses=self.classes, class_vars=self.class_variables, line=self.line, interfs=self.interfaces)
                                 break
                         elif self.current_token == "}":
                             curly_count -= 1
@@ -1698,7 +3249,7 @@ class Interpreter:
                 elif current_token_value == "http":
                     self.advance()
                     next = self.current_token
-                    if next[0] != "KEYWORD":
+                    if next[0] != "KEYWORD" and next[1] not in ("get_many", "cache", "cache_stats", "timeout"):
                         self.error(f"inexistent http function '{next[1]}'", self.line)
                     if next[1] in ("get", "post"):
                         command = next[1]
@@ -1719,32 +3270,103 @@ class Interpreter:
                         response_var = response_var[1]
                         if not self.variables[response_var]["mutable"]:
                             self.error(f"cannot change immutable value of variable '{response_var}'", self.line)
-                        if command == "get":
-                            resp = requests.get(url)
-                            self.variables[response_var]["value"] = {
-                                "code": resp.status_code,
-                                "body": resp.text,
-                                "json": resp.json(),
-                                "url": resp.url,
-                                "headers": resp.headers,
-                                "raw": resp.raw,
-                                "content": resp.content,
-                                "ok": resp.ok,
-                                "reason": resp.reason
-                            }
-                        elif command == "post":
-                            resp = requests.post(url)
-                            self.variables[response_var]["value"] = {
-                                "code": resp.status_code,
-                                "body": resp.text,
-                                "json": resp.json(),
-                                "url": resp.url,
-                                "headers": resp.headers,
-                                "raw": resp.raw,
-                                "content": resp.content,
-                                "ok": resp.ok,
-                                "reason": resp.reason
-                            }
+                        ttl = None
+                        if self.peek() != ("PARENTHESIS", ")"):
+                            self.advance()
+                            ttl = self.current_token
+                            if ttl[0] == "IDENTIFIER":
+                                ttl = self.variables[ttl[1]]["value"]
+                            else:
+                                ttl = ttl[1]
+                            if type(ttl) not in (int, float) or ttl < 0:
+                                self.error(f"invalid cache ttl '{ttl}' for http function (expects a number of seconds)", self.line)
+                        try:
+                            self.variables[response_var]["value"] = yield ("io", self.context.http.request, (command, url, ttl))
+                        except requests.RequestException as e:
+                            self.error(f"http {command} request to '{url}' failed: {e}", self.line)
+                    elif next[1] == "get_many":
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", "("):
+                            self.error("missing opening parenthesis for http get_many() function", self.line)
+                        self.advance()
+                        urls = self.current_token
+                        if urls[0] == "IDENTIFIER":
+                            urls = self.variables[urls[1]]["value"]
+                        else:
+                            urls = urls[1]
+                        if type(urls) != list:
+                            self.error("expected list of urls (or request dicts) as first argument to http get_many() function", self.line)
+                        self.advance()
+                        response_var = self.current_token
+                        if response_var[0] != "IDENTIFIER":
+                            self.error("expected variable as second argument to http get_many() function", self.line)
+                        response_var = response_var[1]
+                        if not self.variables[response_var]["mutable"]:
+                            self.error(f"cannot change immutable value of variable '{response_var}'", self.line)
+                        limit = self.context.http.concurrency
+                        if self.peek() != ("PARENTHESIS", ")"):
+                            self.advance()
+                            limit = self.current_token
+                            if limit[0] == "IDENTIFIER":
+                                limit = self.variables[limit[1]]["value"]
+                            else:
+                                limit = limit[1]
+                            if type(limit) != int or limit < 1:
+                                self.error(f"invalid concurrency limit '{limit}' for http get_many() function (expects a positive integer)", self.line)
+                        self.variables[response_var]["value"] = yield ("io", self.context.http.request_many, (urls, limit))
+                    elif next[1] == "cache":
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", "("):
+                            self.error("missing opening parenthesis for http cache() function", self.line)
+                        self.advance()
+                        folder = self.current_token
+                        if folder[0] == "IDENTIFIER":
+                            folder = self.variables[folder[1]]["value"]
+                        else:
+                            folder = folder[1]
+                        if type(folder) != str:
+                            self.error("expected cache folder (or \"\" for memory only) as argument to http cache() function", self.line)
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", ")"):
+                            self.error("missing closing parenthesis for http cache() function", self.line)
+                        if folder:
+                            folder = os.path.join(self.context.parent_folder, folder)
+                        self.context.http.enable_cache(folder)
+                    elif next[1] == "cache_stats":
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", "("):
+                            self.error("missing opening parenthesis for http cache_stats() function", self.line)
+                        self.advance()
+                        variable = self.current_token
+                        if variable[0] != "IDENTIFIER":
+                            self.error("expected variable to return http cache stats to", self.line)
+                        if not self.variables[variable[1]]["mutable"]:
+                            self.error(f"cannot change immutable value of variable '{variable[1]}'", self.line)
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", ")"):
+                            self.error("missing closing parenthesis for http cache_stats() function", self.line)
+                        cache = self.context.http.cache
+                        stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+                        if cache is not None:
+                            with cache.lock:
+                                stats = dict(cache.stats)
+                        self.variables[variable[1]]["value"] = stats
+                    elif next[1] == "timeout":
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", "("):
+                            self.error("missing opening parenthesis for http timeout() function", self.line)
+                        self.advance()
+                        timeout = self.current_token
+                        if timeout[0] == "IDENTIFIER":
+                            timeout = self.variables[timeout[1]]["value"]
+                        else:
+                            timeout = timeout[1]
+                        if type(timeout) not in (int, float) or timeout <= 0:
+                            self.error(f"invalid timeout '{timeout}' for http timeout() function (expects a positive number of seconds)", self.line)
+                        self.advance()
+                        if self.current_token != ("PARENTHESIS", ")"):
+                            self.error("missing closing parenthesis for http timeout() function", self.line)
+                        self.context.http.timeout = timeout
                     else:
                         self.error(f"inexistent http function '{next[1]}'", self.line)
             elif current_token_type == "MODIFIER":
@@ -1785,8 +3407,9 @@ class Interpreter:
                                     "mutable": True
                                 }
                             idx += 1
-                        new_interp = Interpreter(self.class_variables[class_[1]]["methods"][function[1]]["tokens"])
-                        return_value = new_interp.interpret(variables=self.class_variables[class_[1]]["self"] | vars_, functions=self.class_variables[class_[1]]["methods"], cls=True, classe=self.class_variables[class_[1]], in_function=True)
+                        new_interp = Interpreter(self.class_variables[class_[1]]["methods"][function[1]]["tokens"], context=self.context)
+                        run = self.runner()
+                        return_value = yield from self.traced(f"{class_[1]}.{function[1]}", run(new_interp, variables=self.class_variables[class_[1]]["self"] | vars_, functions=self.class_variables[class_[1]]["methods"], cls=True, classe=self.class_variables[class_[1]], in_function=True), vars_)
                         if self.peek() == ("RETURN_OPERATOR", "->"):
                             variable_name = self.peek(2)
                             self.advance()
@@ -1832,7 +3455,7 @@ class Interpreter:
                             args[idx] = arg[1]
                             idx += 1
                         _class_ = self.classes[class_[1]]
-                        new_interp = Interpreter(_class_["methods"]["init"]["tokens"])
+                        new_interp = Interpreter(_class_["methods"]["init"]["tokens"], context=self.context)
                         parameter_list = {}
                         idx = 0
                         for param in _class_["params"]:
@@ -1841,7 +3464,7 @@ class Interpreter:
                                 "mutable": True
                             }
                             idx += 1
-                        new_interp.interpret(variables=_class_["self"] | parameter_list, cls=True, classe=_class_)
+                        yield from self.traced(f"{class_[1]}.init", new_interp.run(variables=_class_["self"] | parameter_list, cls=True, classe=_class_), parameter_list)
                         if self.peek() == ("RETURN_OPERATOR", "->"):
                             next = self.peek(2)
                             self.advance();self.advance()
@@ -1957,7 +3580,367 @@ class Interpreter:
             return self.variables, self.functions, self.classes, self.class_variables, self.interfaces
         return self.return_value
 
-VERSION_INFO = rf"""{colorama.Fore.CYAN}
+class Program:
+    # lexed once, then run as many times as you want (see compile())
+    def __init__(self, tokens, filename=None):
+        self.tokens = tokens
+        self.filename = filename
+
+    def run(self, variables=None, stdout=None, stdin=None, argv=None, parent_folder=None, use_async=False, hooks=None):
+        if parent_folder is None and self.filename:
+            parent_folder = os.path.dirname(os.path.abspath(self.filename))
+        context = Context(argv=[self.filename or "<program>"] + [str(arg) for arg in argv or []], parent_folder=parent_folder, filename=self.filename, stdout=stdout, stdin=stdin, hooks=hooks)
+        interpreter = Interpreter(self.tokens, context=context)
+        reserved = list(interpreter.variables)
+        for name, value in (variables or {}).items():
+            interpreter.variables[name] = {
+                "value": value,
+                "mutable": True
+            }
+        try:
+            if use_async:
+                run_async(interpreter, variables=interpreter.variables, importing=True)
+            else:
+                interpreter.interpret(variables=interpreter.variables, importing=True)
+        except BasaltExit as e:
+            if e.code not in (0, None):
+                raise BasaltError(f"program exited with code {e.code}", e.line, code=e.code) from e
+        finally:
+            context.close()
+        if stdout is not None:
+            stdout.flush()
+        return {name: record["value"] for name, record in interpreter.variables.items() if name not in reserved}
+
+def lex(source, namespaces=()):
+    # whatever goes wrong in the lexer is a basalt error too, at the line it got to
+    lexer = Lexer(source, keywords=KEYWORDS, namespaces=namespaces)
+    try:
+        return lexer.tokenize()
+    except BasaltError:
+        raise
+    except Exception as e:
+        raise BasaltError(f"{type(e).__name__}: {e}", lexer.line()) from e
+
+def compile(source, filename=None):
+    # embedding entry point: basalt.compile(source).run(variables={...}, stdout=buffer)
+    return Program(lex(source), filename=filename)
+
+class Session:
+    # one long-lived set of tables for the REPL, every entry is lexed on its own and runs against them
+    def __init__(self, context=None):
+        self.context = context or Context()
+        seed = Interpreter([], context=self.context)
+        self.tables = [seed.variables, seed.functions, seed.classes, seed.class_variables, seed.interfaces]
+
+    def interpreter(self, tokens):
+        interpreter = Interpreter(tokens, repl=True, context=self.context)
+        # handed over directly (not as run() arguments) so empty tables are still shared, and whatever ran before an error sticks
+        interpreter.variables, interpreter.functions, interpreter.classes, interpreter.class_variables, interpreter.interfaces = self.tables
+        return interpreter
+
+    def lex(self, source):
+        # aliases imported in earlier entries still lex as lib.name
+        return lex(source, getattr(self.tables[0], "namespaces", ()))
+
+    def run(self, source, tokens=None):
+        interpreter = self.interpreter(tokens if tokens is not None else self.lex(source))
+        try:
+            interpreter.interpret(importing=True)
+        finally:
+            self.tables = [interpreter.variables, interpreter.functions, interpreter.classes, interpreter.class_variables, interpreter.interfaces]
+
+    def bench(self, runs, source):
+        tokens = self.lex(source) # lexed once, only running it gets measured
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            self.run(source, tokens)
+            times.append(time.perf_counter() - start)
+        # one more run under tracemalloc, it slows things down too much to time with it on
+        import tracemalloc
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        self.run(source, tokens)
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1] - start_memory
+        if not tracing:
+            tracemalloc.stop()
+        diff = [stat for stat in after.compare_to(before, "filename") if stat.size_diff > 0]
+        times.sort()
+        return {
+            "runs": runs,
+            "mean": sum(times) / runs,
+            "median": statistics.median(times),
+            "p95": times[min(runs - 1, math.ceil(runs * 0.95) - 1)],
+            "allocated": sum(stat.size_diff for stat in diff),
+            "blocks": sum(max(stat.count_diff, 0) for stat in diff),
+            "peak": peak
+        }
+
+    def profile(self, source):
+        profiler = Profiler()
+        self.context.add_hook(profiler)
+        try:
+            self.run(source)
+        finally:
+            profiler.stop()
+            self.context.remove_hook(profiler)
+        return profiler
+
+def open_blocks(source):
+    # how many { are still waiting for their }, so the REPL knows to keep reading
+    depth = 0
+    for token in lex(source):
+        if token == ("CURLY", "{"):
+            depth += 1
+        elif token == ("CURLY", "}"):
+            depth -= 1
+    return depth
+
+def repl():
+    print(version_info()[:-1])
+    print("Basalt REPL (Build 2026-01-27)")
+    print("Blocks can span several lines, :quit leaves")
+    print(":time [statement], :bench [n] [statement] and :profile [statement] measure things")
+    session = Session()
+    while True:
+        try:
+            entry = input("> ")
+            while open_blocks(entry) > 0:
+                entry += "\n" + input("... ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        except BasaltError as e:
+            report_error(e) # doesn't even lex, nothing to run
+            continue
+        command, _, rest = entry.strip().partition(" ")
+        try:
+            if command in [":quit", ":exit", ":q"]:
+                return
+            elif command == ":time":
+                start = time.perf_counter()
+                session.run(rest)
+                print(f"{(time.perf_counter() - start) * 1000:.3f}ms")
+            elif command == ":bench":
+                runs, _, statement = rest.strip().partition(" ")
+                if not runs.isdigit() or int(runs) < 1 or not statement.strip():
+                    print("Usage: :bench [n] [statement]")
+                    continue
+                stats = session.bench(int(runs), statement)
+                print(f"{stats['runs']} runs: mean {stats['mean'] * 1000:.3f}ms, median {stats['median'] * 1000:.3f}ms, p95 {stats['p95'] * 1000:.3f}ms")
+                print(f"one run allocates {stats['allocated'] / 1024:.1f}KiB still alive afterwards in {stats['blocks']} blocks, peak {stats['peak'] / 1024:.1f}KiB")
+            elif command == ":profile":
+                if not rest.strip():
+                    print("Usage: :profile [statement] (e.g. :profile call main())")
+                    continue
+                print(session.profile(rest).report())
+            elif command.startswith(":"):
+                print(f"Unknown REPL command '{command}'")
+            elif entry.strip():
+                session.run(entry)
+        except BasaltError as e:
+            report_error(e)
+        except KeyboardInterrupt:
+            print("Interrupted")
+
+compiled_cache = {}
+compiled_lock = threading.Lock()
+
+def compile_file(path):
+    # lexed programs stay around for the whole process, until the file changes
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with compiled_lock:
+        cached = compiled_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    with open(path, 'r') as f:
+        program = compile(f.read(), path)
+    with compiled_lock:
+        compiled_cache[path] = (key, program)
+    return program
+
+PACK_MAGIC = b"BASALTPK"
+
+def pack_modules(output, inputs):
+    # archive = magic, index length, json index, then every module's tokens marshalled back to back
+    modules = {}
+    for target in inputs:
+        if os.path.isdir(target):
+            for path in batch_files(target):
+                modules[os.path.relpath(path, target).replace(os.sep, "/")] = path
+        else:
+            modules[os.path.basename(target)] = target
+    blobs, index, offset = [], {}, 0
+    for name, path in sorted(modules.items()):
+        blob = marshal.dumps(compile_file(path).tokens)
+        index[name] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps({"python": list(sys.version_info[:2]), "modules": index}).encode()
+    with open(output, 'wb') as f:
+        f.write(PACK_MAGIC + struct.pack("<I", len(header)) + header)
+        for blob in blobs:
+            f.write(blob)
+    return index
+
+class Archive:
+    # a packed module archive, opened once and mmapped, modules get unmarshalled the first time they're imported
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError(f"'{path}' isn't a Basalt archive")
+        start = len(PACK_MAGIC) + 4
+        length = struct.unpack("<I", self.map[len(PACK_MAGIC):start])[0]
+        header = json.loads(self.map[start:start + length])
+        if tuple(header["python"]) != tuple(sys.version_info[:2]):
+            raise ValueError(f"'{path}' was packed with Python {'.'.join(map(str, header['python']))}, repack it")
+        self.data = start + length
+        self.index = header["modules"]
+        self.programs = {}
+        self.lock = threading.Lock()
+
+    def program(self, name):
+        with self.lock:
+            if name not in self.programs:
+                offset, length = self.index[name]
+                begin = self.data + offset
+                self.programs[name] = Program(marshal.loads(self.map[begin:begin + length]), filename=os.path.join(self.path, name))
+            return self.programs[name]
+
+archive_cache = {}
+
+def open_archive(path):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with compiled_lock:
+        cached = archive_cache.get(path)
+        if not cached or cached[0] != key:
+            cached = archive_cache[path] = (key, Archive(path))
+    return cached[1]
+
+def search_path():
+    # BASALT_PATH: folders and .basaltpack archives to look in when an import isn't next to the script
+    return [entry for entry in os.environ.get("BASALT_PATH", "").split(os.pathsep) if entry]
+
+BENCH_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+BENCH_EXAMPLES = ["fibonacci", "collatz", "FizzBuzz"] # from examples/, the rest of the suite lives in benchmarks/
+
+def bench_cases(folder):
+    # name -> (program, stdin text), plus the lexer case which just lexes everything
+    paths = sorted(glob.glob(os.path.join(folder, "*.basalt")))
+    examples = os.path.join(os.path.dirname(os.path.abspath(folder)), "examples")
+    paths += [os.path.join(examples, name + ".basalt") for name in BENCH_EXAMPLES if os.path.isfile(os.path.join(examples, name + ".basalt"))]
+    cases = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        stdin = os.path.join(folder, name + ".input")
+        cases[name] = (compile_file(path), open(stdin).read() if os.path.isfile(stdin) else "")
+    return cases, paths
+
+def bench_stats(times):
+    times = sorted(times)
+    runs = len(times)
+    mean = sum(times) / runs
+    return {
+        "runs": runs,
+        "mean": mean,
+        "median": statistics.median(times),
+        "min": times[0],
+        "stdev": statistics.stdev(times) if runs > 1 else 0.0
+    }
+
+def run_benchmarks(folder, warmup=2, repeat=10, only=None):
+    cases, paths = bench_cases(folder)
+    results = {}
+    if not only or only in "lexer":
+        source = "\n".join(open(path).read() for path in paths)
+        source = source * max(1, 100000 // max(1, len(source))) # ~100k characters
+        for _ in range(warmup):
+            Lexer(source, keywords=KEYWORDS).tokenize()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            Lexer(source, keywords=KEYWORDS).tokenize()
+            times.append(time.perf_counter() - start)
+        results["lexer"] = bench_stats(times)
+        results["lexer"]["chars_per_second"] = len(source) / results["lexer"]["median"]
+    for name, (program, stdin) in cases.items():
+        if only and only not in name:
+            continue
+        times = []
+        try:
+            for run in range(warmup + repeat):
+                start = time.perf_counter()
+                program.run(stdout=io.StringIO(), stdin=io.StringIO(stdin)) # fresh context every time, output stays off the terminal
+                if run >= warmup:
+                    times.append(time.perf_counter() - start)
+        except BasaltError as e:
+            results[name] = {"error": str(e)}
+            continue
+        results[name] = bench_stats(times)
+    return {"python": sys.version.split()[0], "warmup": warmup, "repeat": repeat, "results": results}
+
+def compare_benchmarks(results, baseline, threshold):
+    # name -> (old median, new median, % change, regressed?) for everything both runs have
+    comparison = {}
+    for name, result in results["results"].items():
+        old = baseline.get("results", {}).get(name, {})
+        if "median" not in result or "median" not in old or old["median"] <= 0:
+            continue
+        change = (result["median"] - old["median"]) / old["median"] * 100
+        comparison[name] = (old["median"], result["median"], change, change > threshold)
+    return comparison
+
+def batch_files(target):
+    if os.path.isdir(target):
+        target = os.path.join(target, "**", "*.basalt")
+    return sorted(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+
+def batch_worker_run(path):
+    stdout = io.StringIO()
+    start = time.perf_counter()
+    code, error = 0, None
+    try:
+        compile_file(path).run(stdout=stdout, stdin=io.StringIO(""))
+    except BasaltError as e:
+        code, error = e.code, str(e)
+    except Exception as e:
+        code, error = 1, f"{type(e).__name__}: {e}"
+    sys.stdout.flush()
+    return {
+        "file": path,
+        "code": code,
+        "stdout": stdout.getvalue(),
+        "error": error,
+        "time": round(time.perf_counter() - start, 6)
+    }
+
+def run_batch(files, jobs):
+    if not files:
+        return []
+    jobs = max(1, min(jobs, len(files)))
+    if jobs == 1:
+        return [batch_worker_run(path) for path in files]
+    sys.stdout.flush()
+    file_pool.flush_all()
+    # workers are forked once and stay warm, so the interpreter and anything imported is only loaded once
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        # a few chunks per worker so one slow script doesn't hold up the rest
+        return list(pool.map(batch_worker_run, files, chunksize=max(1, len(files) // (jobs * 4))))
+
+def version_info():
+    # a function so the banner's colors don't load colorama for every script
+    return rf"""{colorama.Fore.CYAN}
  /$$$$$$$                                /$$   /$$    
 | $$__  $$                              | $$  | $$    
 | $$  \ $$  /$$$$$$   /$$$$$$$  /$$$$$$ | $$ /$$$$$$  
@@ -1979,6 +3962,24 @@ Flags:
   -i, --info        Show engine stats (kind of a flex)
   -r, --run         Run a .basalt file
   -re, --repl       Run the Basalt REPL (BETA)
+  --serve           Run a Basalt server on a unix socket (--serve path.sock), scripts are lexed once and run in a fresh fork each
+  --submit          Run a file on a Basalt server (--submit path.sock file.basalt [args])
+  -p, --pack        Pack .basalt modules (files or folders) into one archive (--pack out.basaltpack lib/)
+                    put the archive in BASALT_PATH (like PATH) so scripts can import from it
+  --bench           Run the benchmark suite (benchmarks/ and some examples/), or the one in a given folder
+                    (--warmup N, --repeat N, --filter name, --json out.json,
+                     --baseline old.json and --threshold percent to fail on regressions)
+  -b, --batch       Run every .basalt file in a folder (or matching a glob) across worker processes
+                    (--jobs N for the number of workers, --json for a JSON summary)
+
+Run Options (after -r file.basalt, use -- to pass them to your script instead):
+  --async           Run wait(), http, input() and spawned functions on an event loop
+  --startup-profile Show how long loading, lexing and on-demand imports took (on stderr)
+  --watch           Run again whenever the script or a file it imports changes
+  --profile         Show where the time went (lines, functions, methods, builtins) on stderr
+                    --profile-top=N rows, --profile-collapsed=file for flamegraphs, --profile-json=file
+  --mem-stats       Show peak RSS, the tracemalloc peak and what the memory went to at exit (on stderr)
+                    --mem-stats=SECONDS also prints a sample every SECONDS while it runs
 
 Basalt Syntax:
   fn name() { }                         Define a function
@@ -1989,8 +3990,18 @@ Basalt Syntax:
   printf("[var]")                       Formatted string printing
   list [op]([args])                     List operations (get, add, remove, len, pop)
   dict [op]([args])                     Dict operations (get, set, delete)
-  file [op]([args])                     File operations (read, write, append)
+  file [op]([args])                     File operations (read, write, append, map, open, close)
+  file [op]([map] [args])               Mapped file operations (slice, find, line)
+  http [op]([args])                     HTTP requests (get, post, get_many, timeout, cache, cache_stats)
   [loop] [condition] { }                Start a loop (repeat, while, foreach)
+  system(cmd [out])                     Run a command (string or argument list), optionally capturing output
+  system batch([cmds] [out] [limit])    Run a list of commands concurrently, capturing all their output
+  parallel foreach x in l -> [out] { }  Run a foreach across worker processes, collecting return values
+  spawn call name(args) -> [handle]     Run a function in the background
+  await [handle] -> [var]               Wait for a background function and get its return value
+  channel [op]([args])                  Channel operations (new, send, recv, close), foreach works on channels too
+  import "file" [as name]               Import a module (everything, or as name.thing without copying it in)
+  import "file" only (a b)              Import just some names from a module
 Good To Know:
   [] vs ()          You can use both [] and () when defining or calling a user-defined function,
                     but you can only use () when calling a pre-defined function (e.g. print()).
@@ -2006,12 +4017,12 @@ INFO_TEXT = """Basalt Engine Information:
   Version: 1.4.0
   Build: 2026-01-31
   Interpreter written in: Python
-  Memory usage: probably a lot considering it's Python and this language is unoptimized
+  Memory usage: {memory}
   Interpreter size: probably between 80-150kb (maybe more)
   Developed by: BasaltDev (i'm not leaking my name bro)
   Originally developed in: ~3-4 days"""
 
-keywords = ["print", "println", "printf", "let", "mut", "immut", "undef", "input",
+KEYWORDS = ["print", "println", "printf", "let", "mut", "immut", "undef", "input",
             "wait", "clear", "exit", "if", "elseif", "else", "and", "or", "not",
             "error", "fn", "call", "return", "repeat", "while", "file", "write",
             "read", "append", "system", "import", "upper", "lower", "trim", "replace",
@@ -2021,58 +4032,580 @@ keywords = ["print", "println", "printf", "let", "mut", "immut", "undef", "input
             "continue", "break", "class", "new", "self", "assert", "enum", "unless",
             "switch", "case", "default", "math", "sin", "cos", "abs", "round", "floor", "ceil", "http", "post"]
 
+# statements that came after 1.4.0 aren't reserved words, older scripts use these names for their variables,
+# an identifier only counts as one when it's followed by what the statement expects
+STATEMENT_WORDS = {
+    "spawn": lambda next: next == ("KEYWORD", "call"),
+    "await": lambda next: next[0] == "IDENTIFIER",
+    "cancel": lambda next: next == ("PARENTHESIS", "("),
+    "channel": lambda next: next[1] in ("new", "send", "recv", "close"),
+    "parallel": lambda next: next == ("KEYWORD", "foreach"),
+}
+
+def run_script(program, argv, options, context=None):
+    # what -r does once the file is lexed, returns the exit status
+    context = context or Context(argv=argv, parent_folder=os.path.dirname(program.filename), filename=program.filename)
+    profiler = None
+    if any(option.split("=", 1)[0].startswith("--profile") for option in options):
+        profiler = Profiler()
+        context.add_hook(profiler)
+    sampler = None
+    if any(option.split("=", 1)[0] == "--mem-stats" for option in options):
+        sampler = MemorySampler(option_value(options, "--mem-stats"))
+    interpreter = Interpreter(program.tokens, context=context)
+    try:
+        if "--async" in options:
+            run_async(interpreter)
+        else:
+            interpreter.interpret()
+    except BasaltError as e:
+        report_error(e)
+        return 1
+    finally:
+        context.close()
+        if profiler is not None:
+            profile_report(profiler, options)
+        if sampler is not None:
+            sampler.stop()
+            print(memory_report(interpreter, context, sampler), file=sys.stderr)
+    return 0
+
+def profile_report(profiler, options):
+    profiler.stop()
+    top = option_value(options, "--profile-top", "15")
+    print(profiler.report(int(top) if top.isdigit() else 15), file=sys.stderr)
+    collapsed = option_value(options, "--profile-collapsed")
+    if collapsed:
+        with open(collapsed, 'w') as f:
+            f.write(profiler.collapsed())
+        print(f"Collapsed stacks written to {collapsed}", file=sys.stderr)
+    dump = option_value(options, "--profile-json")
+    if dump:
+        with open(dump, 'w') as f:
+            json.dump(profiler.to_json(), f, indent=2)
+        print(f"Profile written to {dump}", file=sys.stderr)
+
+def deep_size(obj, seen):
+    # sys.getsizeof only counts the container itself, this follows lists/dicts/tuples down
+    # seen is shared between calls so nothing gets counted twice
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+def format_size(size):
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+def current_rss():
+    # linux only, None anywhere else
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError: # windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # bytes on macos, KiB everywhere else
+
+class MemorySampler:
+    # tracemalloc for the whole run, plus a line on stderr every interval seconds if one was given
+    def __init__(self, interval=None):
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        self.tracing = tracemalloc.is_tracing()
+        if not self.tracing:
+            tracemalloc.start()
+        self.start = time.perf_counter()
+        self.done = threading.Event()
+        self.thread = None
+        try:
+            interval = float(interval) if interval else 0
+        except ValueError:
+            interval = 0
+        if interval > 0:
+            self.thread = threading.Thread(target=self.sample, args=(interval,), daemon=True)
+            self.thread.start()
+
+    def sample(self, interval):
+        while not self.done.wait(interval):
+            current, peak = self.tracemalloc.get_traced_memory()
+            print(f"[mem {time.perf_counter() - self.start:.1f}s] rss {format_size(current_rss())}, "
+                  f"traced {format_size(current)} (peak {format_size(peak)})", file=sys.stderr)
+
+    def stop(self):
+        self.done.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.current, self.peak = self.tracemalloc.get_traced_memory()
+        if not self.tracing:
+            self.tracemalloc.stop()
+        self.peak_rss = peak_rss()
+
+def memory_report(interpreter, context, sampler):
+    # every line only counts what the lines above it didn't, so the breakdown adds up
+    # (function bodies share their tokens with the program, so they mostly cost the list itself)
+    seen = set()
+    rows = []
+    rows.append(("tokens", f"{len(interpreter.tokens)} tokens", deep_size(interpreter.tokens, seen)))
+    bodies = [(name, deep_size(function, seen), len(function["tokens"])) for name, function in interpreter.functions.items()]
+    rows.append(("function bodies", f"{len(bodies)} functions", sum(size for _, size, _ in bodies)))
+    records = [record for record in interpreter.variables.values() if isinstance(record, dict)]
+    payloads = [record["value"] for record in records if isinstance(record.get("value"), (list, dict))]
+    rows.append(("list/dict values", f"{len(payloads)} values", sum(deep_size(value, seen) for value in payloads)))
+    rows.append(("variable records", f"{len(records)} records", deep_size(interpreter.variables, seen)))
+    rows.append(("classes", f"{len(interpreter.classes)} classes", deep_size(interpreter.classes, seen)))
+    rows.append(("class instances", f"{len(interpreter.class_variables)} instances", deep_size(interpreter.class_variables, seen)))
+    modules = list(context.modules.values())
+    rows.append(("imported modules", f"{len(modules)} modules", sum(deep_size(program.tokens, seen) + deep_size(exports, seen) for program, exports in modules)))
+    lines = ["Memory stats:",
+             f"  peak RSS          {format_size(sampler.peak_rss)}",
+             f"  tracemalloc peak  {format_size(sampler.peak)} (still traced at exit: {format_size(sampler.current)})"]
+    for label, count, size in rows:
+        lines.append(f"  {label:<17} {format_size(size):>9}  {count}")
+    for name, size, length in sorted(bodies, key=lambda body: body[1], reverse=True)[:5]:
+        lines.append(f"    {name:<15} {format_size(size):>9}  {length} tokens")
+    return "\n".join(lines)
+
+class FrameWriter:
+    # one json line per chunk of output, so stdout/stderr and the exit status can share one socket
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.gone = False
+
+    def send(self, frame):
+        with self.lock:
+            if self.gone:
+                return
+            try:
+                self.conn.sendall((json.dumps(frame) + "\n").encode())
+            except OSError:
+                # the client hung up, the pumps keep draining the pipes so the script never blocks writing to them
+                self.gone = True
+
+    def pump(self, fd, stream):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = os.read(fd, 65536)
+            data = decoder.decode(chunk, final=not chunk)
+            if data:
+                self.send({"stream": stream, "data": data})
+            if not chunk:
+                break
+        os.close(fd)
+
+def serve_request(conn, request, program):
+    # runs in a fresh fork, so nothing a script does (files, tasks, globals) leaks into the next one
+    frames = FrameWriter(conn)
+    pumps = []
+    for fd, stream in [(1, "stdout"), (2, "stderr")]:
+        read_end, write_end = os.pipe()
+        os.dup2(write_end, fd) # subprocesses from system() write straight to these too
+        os.close(write_end)
+        pump = threading.Thread(target=frames.pump, args=(read_end, stream), daemon=True)
+        pump.start()
+        pumps.append(pump)
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.close(null)
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', buffering=1, closefd=False)
+    sys.stderr = open(2, 'w', buffering=1, closefd=False)
+    code = 1
+    try:
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        code = run_script(program, [program.filename] + [str(arg) for arg in request.get("argv", [])], request.get("options", []))
+    except SystemExit as e:
+        code = e.code if type(e.code) == int else (0 if e.code is None else 1)
+    except BaseException as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+    try:
+        if task_state["pool"]:
+            task_state["pool"].shutdown(wait=True)
+        file_pool.close_all()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.close(1)
+        os.close(2)
+        for pump in pumps:
+            pump.join()
+        frames.send({"exit": code})
+    finally:
+        os._exit(0)
+
+SERVE_REQUEST_TIMEOUT = 10 # seconds a client gets to send its request line
+
+def reap_children():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+def compile_imports(program, folder):
+    # lex every module the script imports by name (and whatever those import) too, same cache as compile_file()
+    finder = Interpreter([], context=Context(parent_folder=folder))
+    pending = [program]
+    seen = set()
+    while pending:
+        tokens = pending.pop().tokens
+        for position in range(len(tokens) - 1):
+            if tokens[position] == ("KEYWORD", "import") and tokens[position + 1][0] == "STRING":
+                try:
+                    path, module = finder.find_module(tokens[position + 1][1])
+                except Exception:
+                    continue # the fork runs into it again and reports it properly
+                if path not in seen:
+                    seen.add(path)
+                    pending.append(module)
+
+def serve_connection(conn, line, server):
+    try:
+        request = json.loads(line)
+        # lexed here in the server, so every later fork starts with it (and its imports) cached
+        program = compile_file(request["file"])
+        compile_imports(program, os.path.dirname(os.path.abspath(request["file"])))
+    except Exception as e:
+        conn.sendall((json.dumps({"stream": "stderr", "data": f"Error: {e}\n"}) + "\n" + json.dumps({"exit": 1}) + "\n").encode())
+        conn.close()
+        return
+    if os.fork() == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        server.close()
+        serve_request(conn, request, program)
+    conn.close()
+
+def serve(path):
+    if os.path.exists(path):
+        os.remove(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(64)
+    preload() # every fork gets these for free
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0)) # cleans up the socket below
+    print(f"Basalt server listening on {path}")
+    sys.stdout.flush()
+    pending = {} # connections still sending their request line -> (what came so far, when they connected)
+    try:
+        while True:
+            reap_children()
+            readable, _, _ = select.select([server] + list(pending), [], [], 1)
+            for sock in readable:
+                if sock is server:
+                    conn, _ = server.accept()
+                    conn.setblocking(False) # one client that never sends anything can't hold up the others
+                    pending[conn] = (b"", time.monotonic())
+                    continue
+                try:
+                    chunk = sock.recv(65536)
+                except OSError:
+                    chunk = b""
+                data = pending[sock][0] + chunk
+                if not chunk:
+                    del pending[sock]
+                    sock.close()
+                elif b"\n" in data:
+                    del pending[sock]
+                    sock.setblocking(True)
+                    serve_connection(sock, data.split(b"\n", 1)[0].decode("utf-8", errors="replace"), server)
+                else:
+                    pending[sock] = (data, pending[sock][1])
+            for conn, (_, since) in list(pending.items()):
+                if time.monotonic() - since > SERVE_REQUEST_TIMEOUT:
+                    del pending[conn]
+                    conn.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for conn in pending:
+            conn.close()
+        server.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+def submit(path, file, argv, options):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    client.sendall((json.dumps({"file": file, "argv": argv, "options": options, "cwd": os.getcwd()}) + "\n").encode())
+    code = 1
+    for line in client.makefile('r'):
+        frame = json.loads(line)
+        if "exit" in frame:
+            code = frame["exit"]
+            break
+        stream = sys.stderr if frame["stream"] == "stderr" else sys.stdout
+        stream.write(frame["data"])
+        stream.flush()
+    client.close()
+    return code
+
+def watched_files(path, context):
+    # the script plus every module it imported (or tried to) from disk, with their mtimes
+    files = {}
+    for file in [path] + context.imported:
+        try:
+            files[file] = os.stat(file).st_mtime_ns
+        except OSError:
+            continue # gone, or a module that came out of an archive
+    return files
+
+def watch(path, argv, options, interval=0.2):
+    path = os.path.abspath(path)
+    while True:
+        context = Context(argv=argv, parent_folder=os.path.dirname(path), filename=path)
+        try:
+            # only files that changed get lexed again, the rest comes out of compile_file()'s cache
+            run_script(compile_file(path), argv, options, context)
+        except SystemExit:
+            pass
+        except OSError as e:
+            print(f"Error: {e}")
+        sys.stdout.flush()
+        files = watched_files(path, context)
+        print(f"{colorama.Fore.CYAN}Watching {len(files)} file{'s' if len(files) != 1 else ''} for changes (Ctrl+C to stop){colorama.Fore.RESET}")
+        changed = []
+        try:
+            while not changed:
+                time.sleep(interval)
+                changed = [file for file, mtime in files.items() if not os.path.exists(file) or os.stat(file).st_mtime_ns != mtime]
+        except KeyboardInterrupt:
+            return
+        print(f"{colorama.Fore.CYAN}{', '.join(os.path.basename(file) for file in changed)} changed, running again{colorama.Fore.RESET}")
+
+def startup_profile(load_time, lex_time, run_time):
+    lines = ["Startup profile:",
+             f"  loading the interpreter  {load_time * 1000:8.2f}ms",
+             f"  lexing the script        {lex_time * 1000:8.2f}ms",
+             f"  running the script       {run_time * 1000:8.2f}ms (includes the imports below)"]
+    if import_times:
+        lines.append("Imported on first use:")
+        for name, seconds in sorted(import_times.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:<24} {seconds * 1000:8.2f}ms")
+    else:
+        lines.append("Nothing else had to be imported.")
+    print("\n".join(lines), file=sys.stderr)
+
+RUN_OPTIONS = ["--async", "--startup-profile", "--watch", "--profile", "--profile-top", "--profile-collapsed", "--profile-json", "--mem-stats"]
+
+def option_value(options, name, default=None):
+    # --name=value run options
+    for option in options:
+        if option.startswith(name + "="):
+            return option.split("=", 1)[1]
+    return default
+
+def run_options(args):
+    # interpreter options can go anywhere after -r, everything else (and anything after --) belongs to the script
+    options, rest = [], []
+    passthrough = False
+    for arg in args:
+        if passthrough:
+            rest.append(arg)
+        elif arg == "--":
+            passthrough = True
+        elif arg.split("=", 1)[0] in RUN_OPTIONS:
+            options.append(arg)
+        else:
+            rest.append(arg)
+    return options, rest
+
 def main():
-    global argv
-    global argc
-    if argc < 2:
-        print(VERSION_INFO)
+    load_time = time.perf_counter() - LOAD_START
+    if len(sys.argv) < 2:
+        print(version_info())
         print("Usage: basalt [-flag/--flag] [file.basalt]")
         return
     
-    argv = argv[1:]
+    argv = sys.argv[1:]
 
-    if argc > 1:
+    if len(sys.argv) > 1:
         flag = sys.argv[1]
 
         if flag in ["-v", "--version"]:
-            print(VERSION_INFO)
+            print(version_info())
             return
         elif flag in ["-h", "--help"]:
             print(HELP_TEXT)
             return
         elif flag in ["-i", "--info"]:
-            print(INFO_TEXT)
+            rss = current_rss() or peak_rss()
+            memory = f"{format_size(rss)} for the interpreter itself" if rss else "unknown on this platform"
+            print(INFO_TEXT.format(memory=memory + " (run a script with --mem-stats for real numbers)"))
             return
         elif flag in ["-r", "--run"]:
-            argv = argv[1:]
+            options, argv = run_options(argv[1:])
             if len(argv) < 1:
                 print("Error: -r/--run flag requires a file name")
                 return
-            global parent_folder
             parent_folder = os.path.dirname(os.path.abspath(argv[0]))
             if not os.path.exists(os.path.join(parent_folder, os.path.basename(argv[0]))):
                 print("Error: Expected an actually existing file to run")
                 return
-            code = open(argv[0], 'r').read()
-            lexer = Lexer(code, keywords=keywords)
-            tokens = lexer.tokenize()
-            interpreter = Interpreter(tokens)
-            interpreter.interpret()
+            if "--watch" in options:
+                watch(argv[0], argv, options)
+                return
+            start = time.perf_counter()
+            program = compile_file(argv[0])
+            lexed = time.perf_counter()
+            try:
+                status = run_script(program, argv, options)
+            finally:
+                if "--startup-profile" in options:
+                    startup_profile(load_time, lexed - start, time.perf_counter() - lexed)
+            if status != 0:
+                sys.exit(1)
+        elif flag in ["--serve"]:
+            if len(argv) < 2:
+                print("Error: --serve flag requires a socket path")
+                return
+            if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+                print("Error: --serve needs unix sockets and fork(), which this OS doesn't have")
+                return
+            serve(argv[1])
+        elif flag in ["--submit"]:
+            options, args = run_options(argv[2:])
+            if len(argv) < 2 or len(args) < 1:
+                print("Error: --submit flag requires a socket path and a file name")
+                return
+            try:
+                code = submit(argv[1], os.path.abspath(args[0]), args[1:], options)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                print(f"Error: couldn't reach the Basalt server at {argv[1]} ({e})")
+                sys.exit(1)
+            sys.exit(code)
+        elif flag in ["-p", "--pack"]:
+            if len(argv) < 3:
+                print("Error: -p/--pack flag requires an output file and at least one module or folder")
+                return
+            missing = [target for target in argv[2:] if not os.path.exists(target)]
+            if missing:
+                print(f"Error: '{missing[0]}' doesn't exist")
+                return
+            index = pack_modules(argv[1], argv[2:])
+            print(f"Packed {len(index)} modules into {argv[1]} ({os.path.getsize(argv[1])} bytes)")
+        elif flag in ["--bench"]:
+            args = argv[1:]
+            folder, settings = BENCH_FOLDER, {"--warmup": "2", "--repeat": "10", "--threshold": "10", "--json": None, "--baseline": None, "--filter": None}
+            while args:
+                arg = args.pop(0)
+                if arg in settings:
+                    if not args:
+                        print(f"Error: {arg} expects a value")
+                        return
+                    settings[arg] = args.pop(0)
+                else:
+                    folder = arg
+            for number in ["--warmup", "--repeat"]:
+                if not settings[number].isdigit():
+                    print(f"Error: {number} expects a number")
+                    return
+            try:
+                threshold = float(settings["--threshold"])
+            except ValueError:
+                print("Error: --threshold expects a percentage")
+                return
+            if not os.path.isdir(folder):
+                print(f"Error: benchmark folder '{folder}' doesn't exist")
+                return
+            baseline = None
+            if settings["--baseline"]:
+                with open(settings["--baseline"]) as f:
+                    baseline = json.load(f)
+            results = run_benchmarks(folder, int(settings["--warmup"]), max(1, int(settings["--repeat"])), settings["--filter"])
+            comparison = compare_benchmarks(results, baseline, threshold) if baseline else {}
+            red = colorama.Fore.RED
+            green = colorama.Fore.GREEN
+            reset = colorama.Fore.RESET
+            print(f"{'benchmark':<18} {'median':>10} {'mean':>10} {'min':>10} {'stdev':>9}" + (f" {'baseline':>10} {'change':>8}" if baseline else ""))
+            for name, result in results["results"].items():
+                if "error" in result:
+                    print(f"{name:<18} {red}{result['error']}{reset}")
+                    continue
+                row = f"{name:<18} {result['median'] * 1000:8.3f}ms {result['mean'] * 1000:8.3f}ms {result['min'] * 1000:8.3f}ms {result['stdev'] * 1000:7.3f}ms"
+                if name in comparison:
+                    old, new, change, regressed = comparison[name]
+                    color = red if regressed else (green if change < -threshold else "")
+                    row += f" {old * 1000:8.3f}ms {color}{change:+7.1f}%{reset if color else ''}"
+                print(row)
+            if settings["--json"]:
+                with open(settings["--json"], 'w') as f:
+                    json.dump(results, f, indent=2)
+                print(f"Results written to {settings['--json']}")
+            regressions = [name for name, (_, _, _, regressed) in comparison.items() if regressed]
+            if regressions:
+                print(f"{red}{len(regressions)} benchmark{'s' if len(regressions) != 1 else ''} regressed by more than {threshold:g}%: {', '.join(regressions)}{reset}")
+                sys.exit(1)
+        elif flag in ["-b", "--batch"]:
+            args = argv[1:]
+            jobs, as_json, targets = os.cpu_count() or 1, False, []
+            while args:
+                arg = args.pop(0)
+                if arg in ["-j", "--jobs"]:
+                    if not args or not args[0].isdigit() or int(args[0]) < 1:
+                        print("Error: --jobs expects a positive number")
+                        return
+                    jobs = int(args.pop(0))
+                elif arg == "--json":
+                    as_json = True
+                else:
+                    targets.append(arg)
+            if not targets:
+                print("Error: -b/--batch flag requires a folder or glob")
+                return
+            files = []
+            for target in targets:
+                files.extend(batch_files(target))
+            if not files:
+                print("Error: no .basalt files matched")
+                return
+            start = time.perf_counter()
+            results = run_batch(files, jobs)
+            elapsed = round(time.perf_counter() - start, 6)
+            failed = [result for result in results if result["code"] != 0]
+            if as_json:
+                print(json.dumps({"scripts": results, "passed": len(results) - len(failed), "failed": len(failed), "time": elapsed}, indent=2))
+            else:
+                red = colorama.Fore.RED
+                green = colorama.Fore.GREEN
+                reset = colorama.Fore.RESET
+                for result in results:
+                    status = f"{green}ok{reset}" if result["code"] == 0 else f"{red}exit {result['code']}{reset}"
+                    print(f"== {result['file']} ({status}, {result['time']:.3f}s)")
+                    if result["stdout"]:
+                        print(result["stdout"], end="" if result["stdout"].endswith("\n") else "\n")
+                    if result["error"]:
+                        print(f"{red}{result['error']}{reset}")
+                print(f"{len(results)} scripts, {len(results) - len(failed)} passed, {len(failed)} failed in {elapsed:.3f}s")
+            if failed:
+                sys.exit(1)
         elif flag in ["-re", "--repl"]:
-            print(VERSION_INFO[:-1])
-            print("Basalt REPL (Build 2026-01-27)")
-            variables, functions, classes, class_variables, interfaces = {}, {}, {}, {}, {}
-            while 1 == 1:
-                command = input("> ")
-                lexer = Lexer(command, keywords=keywords)
-                tokens = lexer.tokenize()
-                interpreter = Interpreter(tokens, repl=True)
-                try:
-                    variables, functions, classes, class_variables, interfaces = interpreter.interpret(variables=variables, functions=functions, clses=classes, class_vars=class_variables, interfs=interfaces, importing=True)
-                finally:
-                    pass
+            repl()
         else:
-            print(VERSION_INFO)
+            print(version_info())
             print("Usage: basalt [-flag/--flag] [file.basalt]")
             return
 if __name__ == "__main__":